@@ -0,0 +1,139 @@
+""" Benchmark summary context packing on a fixed query set: prompt tokens, summary latency and quality
+with the full expanded context versus the token-budgeted, deduplicated one. Runs against the configured
+index, chunk store and OpenAI.
+
+Quality is judged by the summary model itself: for each query it sees the full context and scores both
+summaries (in random order) for faithfulness and coverage. Similarity is the cosine between the two
+summaries' MiniLM embeddings.
+
+Usage: python bench_context_packing.py [--limit 20] [--budget 1500] [--runs 3] [--no-judge]
+"""
+
+import json
+import time
+import random
+import asyncio
+import argparse
+from datetime import datetime
+
+import numpy as np
+
+from config import settings
+from models import SearchQuery
+from search_service import SearchService
+from context_packer import count_tokens
+
+QUERIES = [
+    "bike lanes",
+    "affordable housing levy",
+    "police budget",
+    "homelessness services downtown",
+    "climate action plan",
+    "Aurora Avenue safety",
+    "rent control",
+    "sound transit light rail expansion",
+    "tree canopy protections",
+    "minimum wage for gig workers",
+    "public comment on zoning changes",
+    "parks funding",
+]
+
+JUDGE_PROMPT = """You grade summaries of city council transcript search results. Given the query, the
+transcript segments and two summaries (A and B), score each summary from 1 to 5 for how faithfully and
+completely it covers what the segments say about the query. Respond with JSON only: {"A": <score>, "B": <score>}"""
+
+async def summarise(service: SearchService, messages: list, runs: int):
+    latencies, prompt_tokens, summary = [], None, None
+    for _ in range(runs):
+        start = time.perf_counter()
+        completion = await service._chat(messages, timeout=settings.SUMMARY_TIMEOUT)
+        latencies.append(time.perf_counter() - start)
+        prompt_tokens = completion.usage.prompt_tokens
+        summary = completion.choices[0].message.content
+    return summary, prompt_tokens, float(np.median(latencies))
+
+async def judge(service: SearchService, query: str, full_context: str, summaries: dict, rng) -> dict:
+    labels = list(summaries)
+    rng.shuffle(labels)
+    completion = await service._chat(
+        [
+            {"role": "system", "content": JUDGE_PROMPT},
+            {"role": "user", "content": f"Query: {query}\n\n{full_context}\n\n"
+                                        f"Summary A: {summaries[labels[0]]}\n\nSummary B: {summaries[labels[1]]}"}
+        ],
+        timeout=settings.SUMMARY_TIMEOUT
+    )
+    scores = json.loads(completion.choices[0].message.content.strip().strip("`").removeprefix("json"))
+    return {labels[0]: float(scores["A"]), labels[1]: float(scores["B"])}
+
+async def run(args):
+    service = SearchService()
+    settings.SUMMARY_CONTEXT_TOKENS = args.budget
+    current_date = datetime.now().strftime("%Y-%m-%d")
+    rng = random.Random(0)
+    rows = []
+
+    try:
+        for query in QUERIES:
+            results, _, _ = await service._retrieve(SearchQuery(query=query, limit=args.limit, summarize=False))
+            if not results:
+                continue
+
+            row = {"query": query}
+            for mode, packing in (("full", False), ("packed", True)):
+                settings.CONTEXT_PACKING = packing
+                start = time.perf_counter()
+                contexts = await service._summary_contexts(results, query, None)
+                row[f"{mode}_build_ms"] = (time.perf_counter() - start) * 1000
+                messages = service._summary_messages(contexts, query, current_date)
+                row[f"{mode}_local_tokens"] = sum(count_tokens(m["content"]) for m in messages)
+                row[f"{mode}_summary"], row[f"{mode}_tokens"], row[f"{mode}_latency"] = \
+                    await summarise(service, messages, args.runs)
+                if mode == "full":
+                    full_context = messages[1]["content"]
+
+            vectors = await service.vector_store.embed_many([row["full_summary"], row["packed_summary"]])
+            row["similarity"] = float(np.dot(vectors[0], vectors[1]))
+            if args.judge:
+                scores = await judge(
+                    service, query, full_context,
+                    {"full": row["full_summary"], "packed": row["packed_summary"]}, rng
+                )
+                row["full_score"], row["packed_score"] = scores["full"], scores["packed"]
+            rows.append(row)
+
+            print(f"{query[:32]:<32} tokens {row['full_tokens']:>5} -> {row['packed_tokens']:>5}   "
+                  f"latency {row['full_latency']:.2f}s -> {row['packed_latency']:.2f}s   "
+                  f"similarity {row['similarity']:.2f}"
+                  + (f"   score {row['full_score']:.0f} / {row['packed_score']:.0f}" if args.judge else ""))
+    finally:
+        await service.close()
+
+    if not rows:
+        print("No query returned results")
+        return
+
+    def mean(key):
+        return float(np.mean([row[key] for row in rows]))
+
+    print(f"\n{len(rows)} queries, limit {args.limit}, budget {args.budget} tokens, median of {args.runs} runs")
+    print(f"{'':<8} {'prompt tok':>10} {'local tok':>10} {'build ms':>9} {'latency s':>10}"
+          + (f" {'score':>6}" if args.judge else ""))
+    for mode in ("full", "packed"):
+        print(f"{mode:<8} {mean(f'{mode}_tokens'):>10.0f} {mean(f'{mode}_local_tokens'):>10.0f} "
+              f"{mean(f'{mode}_build_ms'):>9.1f} {mean(f'{mode}_latency'):>10.2f}"
+              + (f" {mean(f'{mode}_score'):>6.2f}" if args.judge else ""))
+    print(f"prompt tokens {mean('packed_tokens') / mean('full_tokens') - 1:+.0%}, "
+          f"latency {mean('packed_latency') / mean('full_latency') - 1:+.0%}, "
+          f"summary similarity {mean('similarity'):.2f}")
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--limit", type=int, default=20)
+    parser.add_argument("--budget", type=int, default=settings.SUMMARY_CONTEXT_TOKENS)
+    parser.add_argument("--runs", type=int, default=3)
+    parser.add_argument("--no-judge", dest="judge", action="store_false")
+    asyncio.run(run(parser.parse_args()))
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,81 @@
+""" Benchmark the PyTorch and int8 ONNX embedding backends: load time, single-query latency,
+batch throughput and resident memory. Each backend runs in a fresh process so RSS is not shared.
+
+Usage: python bench_embedding.py [--onnx-model onnx_model] [--queries 200] [--batch-size 128] [--threads 4]
+"""
+
+import sys
+import json
+import time
+import argparse
+import subprocess
+import numpy as np
+
+from embedding_model import load_embedding_model
+
+def rss_mb() -> float:
+    with open("/proc/self/status") as f:
+        for line in f:
+            if line.startswith("VmRSS:"):
+                return int(line.split()[1]) / 1024
+    return float("nan")
+
+def synthetic_texts(count: int, words: int, rng) -> list:
+    vocab = ("council budget housing transit zoning motion ordinance police parks levy district "
+             "amendment public comment seattle committee vote resolution funding street").split()
+    return [" ".join(rng.choice(vocab, size=words)) for _ in range(count)]
+
+def run_backend(backend: str, args) -> dict:
+    rng = np.random.default_rng(0)
+    baseline = rss_mb()
+    start = time.perf_counter()
+    model = load_embedding_model(backend, args.onnx_model, threads=args.threads)
+    model.encode("warmup")
+    load_seconds = time.perf_counter() - start
+
+    latencies = []
+    for text in synthetic_texts(args.queries, 8, rng):
+        start = time.perf_counter()
+        model.encode(text)
+        latencies.append(time.perf_counter() - start)
+    latencies.sort()
+
+    chunks = synthetic_texts(args.chunks, 90, rng)  # ~500-character transcript chunks
+    start = time.perf_counter()
+    model.encode(chunks, batch_size=args.batch_size)
+    throughput = len(chunks) / (time.perf_counter() - start)
+
+    return {
+        "load_s": load_seconds,
+        "p50_ms": latencies[len(latencies) // 2] * 1000,
+        "p99_ms": latencies[min(len(latencies) - 1, int(len(latencies) * 0.99))] * 1000,
+        "chunks_per_s": throughput,
+        "rss_mb": rss_mb() - baseline,
+    }
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--onnx-model", default="onnx_model")
+    parser.add_argument("--queries", type=int, default=200)
+    parser.add_argument("--chunks", type=int, default=1024)
+    parser.add_argument("--batch-size", type=int, default=128)
+    parser.add_argument("--threads", type=int, default=4)
+    parser.add_argument("--backend", help=argparse.SUPPRESS)  # set when running as a child process
+    args = parser.parse_args()
+
+    if args.backend:
+        print(json.dumps(run_backend(args.backend, args)))
+        return
+
+    print(f"{'backend':<8} {'load (s)':>9} {'p50 (ms)':>9} {'p99 (ms)':>9} {'chunks/s':>9} {'RSS (MB)':>9}")
+    for backend in ("torch", "onnx"):
+        output = subprocess.run(
+            [sys.executable, __file__, "--backend", backend] + sys.argv[1:],
+            capture_output=True, text=True, check=True
+        ).stdout
+        stats = json.loads(output.strip().splitlines()[-1])
+        print(f"{backend:<8} {stats['load_s']:>9.2f} {stats['p50_ms']:>9.2f} {stats['p99_ms']:>9.2f} "
+              f"{stats['chunks_per_s']:>9.1f} {stats['rss_mb']:>9.0f}")
+
+if __name__ == "__main__":
+    main()
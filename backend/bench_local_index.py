@@ -0,0 +1,85 @@
+""" Benchmark the local vector index: QPS and recall@k of exact and IVF search against float32 brute force.
+
+Usage: python bench_local_index.py [--rows 200000] [--queries 200] [--top-k 10] [--dtype float16]
+"""
+
+import time
+import shutil
+import argparse
+import tempfile
+import numpy as np
+
+from local_index import LocalIndex
+
+DIM = 384
+
+def synthetic_embeddings(rows: int, clusters: int, rng) -> np.ndarray:
+    """Clustered unit vectors, closer to real transcript embeddings than uniform noise."""
+    centers = rng.normal(size=(clusters, DIM)).astype(np.float32)
+    vectors = centers[rng.integers(0, clusters, size=rows)] + 0.6 * rng.normal(size=(rows, DIM)).astype(np.float32)
+    return vectors / np.linalg.norm(vectors, axis=1, keepdims=True)
+
+def run_queries(index: LocalIndex, queries: np.ndarray, top_k: int):
+    start = time.perf_counter()
+    results = [
+        [match.id for match in index.query(vector=q.tolist(), top_k=top_k, namespace="bench").matches]
+        for q in queries
+    ]
+    return results, len(queries) / (time.perf_counter() - start)
+
+def recall(results, truth) -> float:
+    hits = sum(len(set(found) & set(expected)) for found, expected in zip(results, truth))
+    return hits / sum(len(expected) for expected in truth)
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--rows", type=int, default=200_000)
+    parser.add_argument("--queries", type=int, default=200)
+    parser.add_argument("--top-k", type=int, default=10)
+    parser.add_argument("--dtype", default="float32", choices=["float16", "float32"])
+    parser.add_argument("--nprobe", type=int, nargs="+", default=[4, 8, 16, 32])
+    args = parser.parse_args()
+
+    rng = np.random.default_rng(0)
+    vectors = synthetic_embeddings(args.rows, clusters=256, rng=rng)
+    queries = synthetic_embeddings(args.queries, clusters=256, rng=rng)
+
+    print(f"Brute force ground truth over {args.rows} x {DIM} float32...")
+    start = time.perf_counter()
+    truth = []
+    for q in queries:
+        scores = vectors @ q
+        top = np.argpartition(-scores, args.top_k - 1)[:args.top_k]
+        truth.append([f"v{i}" for i in top])
+    brute_qps = len(queries) / (time.perf_counter() - start)
+
+    path = tempfile.mkdtemp(prefix="local_index_bench_")
+    try:
+        index = LocalIndex(path, dtype=args.dtype)
+        for start in range(0, args.rows, 10_000):
+            batch = vectors[start:start + 10_000]
+            index.upsert(
+                [{"id": f"v{start + i}", "values": v, "metadata": {}} for i, v in enumerate(batch)],
+                namespace="bench"
+            )
+
+        print(f"\n{'mode':<20} {'QPS':>10} {'recall@' + str(args.top_k):>10}")
+        print(f"{'numpy brute force':<20} {brute_qps:>10.1f} {1.0:>10.3f}")
+
+        results, qps = run_queries(index, queries, args.top_k)
+        print(f"{'exact ' + args.dtype:<20} {qps:>10.1f} {recall(results, truth):>10.3f}")
+
+        start = time.perf_counter()
+        index.build_ivf(namespace="bench")
+        print(f"(IVF build: {time.perf_counter() - start:.1f}s)")
+
+        index.search = "ivf"
+        for nprobe in args.nprobe:
+            index.nprobe = nprobe
+            results, qps = run_queries(index, queries, args.top_k)
+            print(f"{'ivf nprobe=' + str(nprobe):<20} {qps:>10.1f} {recall(results, truth):>10.3f}")
+    finally:
+        shutil.rmtree(path)
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,55 @@
+""" Parity check between the PyTorch and int8 ONNX embedding backends.
+
+Embeds sample texts with both and reports cosine similarity per text. Exits non-zero if any text
+falls below --min-cosine, since vectors from the two backends share one index.
+
+Usage: python check_onnx_parity.py [--onnx-model onnx_model] [--texts-file chunks.txt] [--min-cosine 0.99]
+"""
+
+import sys
+import argparse
+import numpy as np
+
+from embedding_model import load_embedding_model
+
+SAMPLE_TEXTS = [
+    "What did the council decide about bike lanes on Aurora Avenue?",
+    "CB 120345 relating to affordable housing",
+    "Councilmember Mosqueda moved to amend the budget to fund homelessness services.",
+    "I want to thank everyone who came out for public comment tonight on the transportation levy.",
+    "The motion carries and the ordinance passes.",
+    "zoning",
+    "Can the department clarify how many officers were hired under the 2023 budget, "
+    "and whether the overtime figures in the quarterly report include special events? "
+    "We have heard from residents in District 3 who are concerned about response times.",
+]
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--onnx-model", default="onnx_model")
+    parser.add_argument("--texts-file", help="one text per line, e.g. a sample of indexed chunks")
+    parser.add_argument("--min-cosine", type=float, default=0.99)
+    args = parser.parse_args()
+
+    texts = SAMPLE_TEXTS
+    if args.texts_file:
+        with open(args.texts_file) as f:
+            texts = [line.strip() for line in f if line.strip()]
+
+    reference = load_embedding_model("torch").encode(texts, convert_to_numpy=True)
+    candidate = load_embedding_model("onnx", args.onnx_model).encode(texts)
+    cosines = np.sum(reference * candidate, axis=1) / (
+        np.linalg.norm(reference, axis=1) * np.linalg.norm(candidate, axis=1)
+    )
+
+    worst = int(np.argmin(cosines))
+    print(f"texts: {len(texts)}")
+    print(f"cosine mean: {cosines.mean():.5f}  min: {cosines.min():.5f}  p1: {np.percentile(cosines, 1):.5f}")
+    print(f"worst: {texts[worst][:80]!r}")
+    if cosines.min() < args.min_cosine:
+        print(f"FAIL: cosine below {args.min_cosine}")
+        sys.exit(1)
+    print("OK")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,79 @@
+"""
+Chunk metadata fields and encodings shared by ingestion and search.
+"""
+
+from datetime import date, datetime
+from typing import Optional, Union
+
+_EPOCH = date(1970, 1, 1)
+
+def epoch_day(value: Union[str, date, datetime]) -> int:
+    """Days since 1970-01-01 for an ISO string, date or datetime (calendar date as recorded)."""
+    if isinstance(value, str):
+        value = datetime.fromisoformat(value)
+    if isinstance(value, datetime):
+        value = value.date()
+    return (value - _EPOCH).days
+
+def build_filter(start_date: Optional[datetime] = None, end_date: Optional[datetime] = None,
+                 speaker: Optional[str] = None, meeting_body: Optional[str] = None) -> Optional[dict]:
+    """Translate search constraints into a Pinecone metadata filter, or None if unconstrained."""
+    metadata_filter = {}
+
+    day_range = {}
+    if start_date:
+        day_range["$gte"] = epoch_day(start_date)
+    if end_date:
+        day_range["$lte"] = epoch_day(end_date)
+    if day_range:
+        metadata_filter["session_day"] = day_range
+
+    if speaker:
+        # Chunks list every speaker in them; a list field matches if any element does
+        metadata_filter["speakers"] = {"$in": [speaker]}
+    if meeting_body:
+        metadata_filter["annotation_meeting_name"] = {"$eq": meeting_body}
+
+    return metadata_filter or None
+
+def matches_filter(metadata: dict, metadata_filter: Optional[dict]) -> bool:
+    """Evaluate a Pinecone-style filter against one record's metadata, for results that bypassed the index."""
+    if not metadata_filter:
+        return True
+    for key, condition in metadata_filter.items():
+        if key == "$and":
+            if not all(matches_filter(metadata, clause) for clause in condition):
+                return False
+            continue
+        if key == "$or":
+            if not any(matches_filter(metadata, clause) for clause in condition):
+                return False
+            continue
+
+        if not isinstance(condition, dict):
+            condition = {"$eq": condition}
+        value = metadata.get(key)
+        values = value if isinstance(value, list) else [value]
+        for op, expected in condition.items():
+            if op == "$eq" and expected not in values:
+                return False
+            if op == "$ne" and expected in values:
+                return False
+            if op == "$in" and not any(v in expected for v in values):
+                return False
+            if op == "$nin" and any(v in expected for v in values):
+                return False
+            if op == "$exists" and (value is not None) != expected:
+                return False
+            if op in ("$gt", "$gte", "$lt", "$lte"):
+                if not isinstance(value, (int, float)):
+                    return False
+                if op == "$gt" and not value > expected:
+                    return False
+                if op == "$gte" and not value >= expected:
+                    return False
+                if op == "$lt" and not value < expected:
+                    return False
+                if op == "$lte" and not value <= expected:
+                    return False
+    return True
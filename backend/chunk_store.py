@@ -0,0 +1,120 @@
+"""
+SQLite side store for chunk text and meeting-level fields that vector records don't carry.
+"""
+
+import json
+import sqlite3
+import threading
+from typing import Dict, Iterable, List, Tuple
+
+# SQLite's default limit on bound parameters per statement is 999
+_LOOKUP_BATCH = 900
+
+class ChunkStore:
+    def __init__(self, path: str = "chunk_store.sqlite"):
+        self.conn = sqlite3.connect(path, check_same_thread=False)
+        self._lock = threading.Lock()
+        with self._lock:
+            # WAL lets the backend read while ingestion writes
+            self.conn.execute("PRAGMA journal_mode=WAL")
+            self.conn.execute("""
+                CREATE TABLE IF NOT EXISTS transcripts (
+                    namespace TEXT NOT NULL,
+                    transcript_id TEXT NOT NULL,
+                    fields TEXT NOT NULL,
+                    PRIMARY KEY (namespace, transcript_id)
+                )
+            """)
+            self.conn.execute("""
+                CREATE TABLE IF NOT EXISTS chunks (
+                    namespace TEXT NOT NULL,
+                    chunk_id TEXT NOT NULL,
+                    transcript_id TEXT NOT NULL,
+                    text TEXT NOT NULL,
+                    position INTEGER,
+                    start_time REAL,
+                    end_time REAL,
+                    PRIMARY KEY (namespace, chunk_id)
+                )
+            """)
+            # Stores written before neighbour expansion lack these; their chunks are simply not expanded
+            columns = {row[1] for row in self.conn.execute("PRAGMA table_info(chunks)")}
+            for column, kind in (("position", "INTEGER"), ("start_time", "REAL"), ("end_time", "REAL")):
+                if column not in columns:
+                    self.conn.execute(f"ALTER TABLE chunks ADD COLUMN {column} {kind}")
+            self.conn.execute(
+                "CREATE INDEX IF NOT EXISTS chunks_by_position ON chunks (namespace, transcript_id, position)"
+            )
+            self.conn.commit()
+
+    def put_transcript(self, namespace: str, transcript_id: str, fields: dict):
+        """Store meeting-level fields (event id, meeting name, session date, ...) once per transcript."""
+        with self._lock:
+            self.conn.execute(
+                "INSERT OR REPLACE INTO transcripts VALUES (?, ?, ?)",
+                (namespace, transcript_id, json.dumps(fields, default=str))
+            )
+            self.conn.commit()
+
+    def put_chunks(self, namespace: str, chunks: Iterable[Tuple[str, str, int, float, float, str]]):
+        """Store (chunk_id, transcript_id, position, start_time, end_time, text) rows."""
+        with self._lock:
+            self.conn.executemany(
+                "INSERT OR REPLACE INTO chunks "
+                "(namespace, chunk_id, transcript_id, position, start_time, end_time, text) "
+                "VALUES (?, ?, ?, ?, ?, ?, ?)",
+                ((namespace, *chunk) for chunk in chunks)
+            )
+            self.conn.commit()
+
+    def delete_chunks(self, namespace: str, chunk_ids: List[str]):
+        with self._lock:
+            self.conn.executemany(
+                "DELETE FROM chunks WHERE namespace = ? AND chunk_id = ?",
+                ((namespace, chunk_id) for chunk_id in chunk_ids)
+            )
+            self.conn.commit()
+
+    def get_many(self, namespace: str, chunk_ids: List[str]) -> Dict[str, dict]:
+        """Chunk id -> {"text", **transcript fields} for the ids present, in one join per 900 ids."""
+        found = {}
+        with self._lock:
+            for start in range(0, len(chunk_ids), _LOOKUP_BATCH):
+                batch = chunk_ids[start:start + _LOOKUP_BATCH]
+                rows = self.conn.execute(
+                    "SELECT c.chunk_id, c.text, t.fields FROM chunks c "
+                    "LEFT JOIN transcripts t ON t.namespace = c.namespace AND t.transcript_id = c.transcript_id "
+                    f"WHERE c.namespace = ? AND c.chunk_id IN ({','.join('?' * len(batch))})",
+                    (namespace, *batch)
+                ).fetchall()
+                for chunk_id, text, fields in rows:
+                    found[chunk_id] = {**(json.loads(fields) if fields else {}), "text": text}
+        return found
+
+    def get_neighbours(self, namespace: str, chunk_ids: List[str], radius: int) -> Dict[str, List[dict]]:
+        """
+        Chunk id -> the chunks within `radius` positions of it in the same transcript (itself included),
+        in position order. One self-join per 900 ids, served by the (transcript_id, position) index.
+        """
+        found = {}
+        with self._lock:
+            for start in range(0, len(chunk_ids), _LOOKUP_BATCH):
+                batch = chunk_ids[start:start + _LOOKUP_BATCH]
+                rows = self.conn.execute(
+                    "SELECT h.chunk_id, n.chunk_id, n.transcript_id, n.position, n.start_time, n.end_time, n.text "
+                    "FROM chunks h JOIN chunks n ON n.namespace = h.namespace AND n.transcript_id = h.transcript_id "
+                    "AND n.position BETWEEN h.position - ? AND h.position + ? "
+                    f"WHERE h.namespace = ? AND h.chunk_id IN ({','.join('?' * len(batch))}) "
+                    "ORDER BY h.chunk_id, n.position",
+                    (radius, radius, namespace, *batch)
+                ).fetchall()
+                for hit_id, chunk_id, transcript_id, position, start_time, end_time, text in rows:
+                    found.setdefault(hit_id, []).append({
+                        "chunk_id": chunk_id,
+                        "transcript_id": transcript_id,
+                        "position": position,
+                        "start_time": start_time,
+                        "end_time": end_time,
+                        "text": text
+                    })
+        return found
@@ -0,0 +1,160 @@
+"""
+Client construction and resilience helpers for OpenAI, Pinecone and Redis: sized connection pools
+with keep-alive, per-call timeouts, jittered retries, hedged requests and a circuit breaker.
+"""
+
+import time
+import random
+import asyncio
+import httpx
+import openai
+import pinecone
+import redis.asyncio as redis
+from redis.asyncio.retry import Retry
+from redis.backoff import DecorrelatedJitterBackoff
+from openai import AsyncOpenAI
+
+from config import settings
+from metrics import Counter, Gauge
+
+CLIENT_RETRIES = Counter("client_retries_total", "Retried client calls by client")
+HEDGED_REQUESTS = Counter("hedged_requests_total", "Hedge requests fired after the primary was slow, by client")
+BREAKER_OPEN = Gauge("circuit_breaker_open", "1 while a circuit breaker is open and calls are skipped")
+BREAKER_SKIPS = Counter("circuit_breaker_skipped_total", "Calls skipped because the breaker was open")
+
+# Transient OpenAI failures worth another attempt; anything else (bad request, auth) fails fast
+OPENAI_RETRYABLE = (
+    openai.APIConnectionError,
+    openai.APITimeoutError,
+    openai.RateLimitError,
+    openai.InternalServerError,
+)
+
+def create_openai_client() -> AsyncOpenAI:
+    http_client = httpx.AsyncClient(
+        limits=httpx.Limits(
+            max_connections=settings.OPENAI_MAX_CONNECTIONS,
+            max_keepalive_connections=settings.OPENAI_MAX_CONNECTIONS,
+            keepalive_expiry=60
+        ),
+        timeout=httpx.Timeout(settings.OPENAI_TIMEOUT, connect=2.0)
+    )
+    # Retries are done by with_retries so they share the circuit breaker and jitter policy
+    return AsyncOpenAI(api_key=settings.OPENAI_API_KEY, http_client=http_client, max_retries=0)
+
+def create_redis_client():
+    pool = redis.BlockingConnectionPool.from_url(
+        settings.REDIS_URL,
+        max_connections=settings.REDIS_MAX_CONNECTIONS,
+        timeout=settings.REDIS_TIMEOUT,  # wait for a free connection
+        socket_timeout=settings.REDIS_TIMEOUT,
+        socket_connect_timeout=settings.REDIS_TIMEOUT,
+        socket_keepalive=True,
+        health_check_interval=30,
+        retry=Retry(DecorrelatedJitterBackoff(cap=0.2, base=0.01), retries=2),
+        retry_on_timeout=True
+    )
+    return redis.Redis(connection_pool=pool)
+
+def create_pinecone_index():
+    pc = pinecone.Pinecone(api_key=settings.PINECONE_API_KEY, pool_threads=settings.PINECONE_POOL_THREADS)
+    return pc.Index(
+        "council-transcripts",
+        pool_threads=settings.PINECONE_POOL_THREADS,
+        connection_pool_maxsize=settings.PINECONE_POOL_MAXSIZE
+    )
+
+async def with_retries(call, client: str, attempts: int, retry_on=(Exception,),
+                       base_delay: float = 0.05, max_delay: float = 1.0):
+    """
+    Await call() up to `attempts` times, sleeping with full jitter between attempts
+    so retries from concurrent requests don't arrive in lockstep.
+    """
+    for attempt in range(attempts):
+        try:
+            return await call()
+        except retry_on as e:
+            if attempt == attempts - 1:
+                raise
+            CLIENT_RETRIES.inc(client=client)
+            delay = random.uniform(0, min(max_delay, base_delay * 2 ** attempt))
+            print(f"{client} call failed ({e}), retrying in {delay * 1000:.0f}ms")
+            await asyncio.sleep(delay)
+
+async def hedged(call, client: str, hedge_after: float, timeout: float):
+    """
+    Await call(); if it hasn't returned after hedge_after seconds, start a second identical call
+    and return whichever succeeds first. Raises TimeoutError if neither finishes within timeout.
+    """
+    tasks = [asyncio.ensure_future(call())]
+    deadline = time.monotonic() + timeout
+    try:
+        done, _ = await asyncio.wait(tasks, timeout=min(hedge_after, timeout))
+        if not done:
+            HEDGED_REQUESTS.inc(client=client)
+            tasks.append(asyncio.ensure_future(call()))
+
+        error = None
+        pending = set(tasks)
+        while pending:
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                break
+            done, pending = await asyncio.wait(pending, timeout=remaining, return_when=asyncio.FIRST_COMPLETED)
+            for task in done:
+                if task.exception() is None:
+                    return task.result()
+                error = task.exception()
+        if error is not None and not pending:
+            raise error
+        raise asyncio.TimeoutError(f"{client} call timed out after {timeout}s")
+    finally:
+        for task in tasks:
+            task.cancel()
+
+class CircuitBreaker:
+    """
+    Opens after `failure_threshold` consecutive failures and skips calls for `reset_timeout` seconds.
+    After that a single trial call is let through; success closes the breaker, failure reopens it.
+    A cancelled trial is released without counting as a failure; one whose outcome is never
+    recorded stops blocking new trials after another reset_timeout.
+    """
+
+    def __init__(self, name: str, failure_threshold: int, reset_timeout: float):
+        self.name = name
+        self.failure_threshold = failure_threshold
+        self.reset_timeout = reset_timeout
+        self.failures = 0
+        self.opened_at = None
+        self._trial_started = None
+        BREAKER_OPEN.set(0, name=name)
+
+    def allow(self) -> bool:
+        if self.opened_at is None:
+            return True
+        now = time.monotonic()
+        trial_open = self._trial_started is None or now - self._trial_started >= self.reset_timeout
+        if now - self.opened_at >= self.reset_timeout and trial_open:
+            self._trial_started = now
+            return True
+        BREAKER_SKIPS.inc(name=self.name)
+        return False
+
+    def record_success(self):
+        self.failures = 0
+        self.opened_at = None
+        self._trial_started = None
+        BREAKER_OPEN.set(0, name=self.name)
+
+    def release_trial(self):
+        """Give up a granted call that was cancelled before it had an outcome."""
+        self._trial_started = None
+
+    def record_failure(self):
+        self.failures += 1
+        self._trial_started = None
+        if self.opened_at is not None or self.failures >= self.failure_threshold:
+            if self.opened_at is None:
+                print(f"Circuit breaker {self.name} opened after {self.failures} failures")
+            self.opened_at = time.monotonic()
+            BREAKER_OPEN.set(1, name=self.name)
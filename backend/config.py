@@ -2,13 +2,134 @@
 Config settings and environment variable handling.
 """
 
+from typing import List
 from pydantic_settings import BaseSettings, SettingsConfigDict
 
 class Settings(BaseSettings):
     PROJECT_NAME: str = "civicly-ai"
     OPENAI_API_KEY: str
-    PINECONE_API_KEY: str
+    PINECONE_API_KEY: str = ""
     REDIS_URL: str = "redis://localhost:6379"
+    PINECONE_NAMESPACE: str = "seattle"
+    # Namespaces a query may select: PINECONE_NAMESPACE and the extra chunk layouts ingestion
+    # writes to <PINECONE_NAMESPACE>-<layout>
+    NAMESPACE_LAYOUTS: List[str] = ["chars", "tokens", "turns", "sentences"]
+
+    # "pinecone" or "local" (file-backed index under LOCAL_INDEX_PATH, no network)
+    VECTOR_BACKEND: str = "pinecone"
+    LOCAL_INDEX_PATH: str = "local_index_data"
+    # float16 halves memory, but exact scans then pay for converting rows to float32; pair it with ivf
+    LOCAL_INDEX_DTYPE: str = "float32"
+    LOCAL_INDEX_SEARCH: str = "exact"  # "exact" or "ivf"
+    LOCAL_INDEX_NPROBE: int = 8
+
+    # SQLite side store with chunk text and meeting-level fields, written by ingestion
+    CHUNK_STORE_PATH: str = "chunk_store.sqlite"
+
+    # Before summarising, widen the top CONTEXT_EXPAND_TOP hits by CONTEXT_WINDOW chunks either side
+    # from the chunk store, merged into one context per meeting
+    CONTEXT_EXPANSION: bool = True
+    CONTEXT_WINDOW: int = 1
+    CONTEXT_EXPAND_TOP: int = 5
+
+    # Pack summary contexts into at most SUMMARY_CONTEXT_TOKENS prompt tokens: MMR over segment
+    # embeddings orders them, and segments this similar to one already packed are dropped
+    CONTEXT_PACKING: bool = True
+    SUMMARY_CONTEXT_TOKENS: int = 1500
+    CONTEXT_MMR_LAMBDA: float = 0.7
+    CONTEXT_DUPLICATE_THRESHOLD: float = 0.95
+
+    # Hybrid retrieval: BM25 over chunk text fused with vector results by reciprocal rank
+    HYBRID_SEARCH: bool = True
+    KEYWORD_INDEX_PATH: str = "keyword_index_data"
+    RRF_K: int = 60
+    # Identifier-style queries (ordinance numbers, names) with keyword hits skip LLM enhancement
+    KEYWORD_SKIP_ENHANCEMENT: bool = True
+
+    # Optional cross-encoder rerank (SearchQuery.rerank): over-fetch, rescore, cut to limit
+    RERANK_MODEL: str = "cross-encoder/ms-marco-MiniLM-L-6-v2"
+    RERANK_OVERFETCH: int = 5
+    RERANK_BATCH_SIZE: int = 16
+    RERANK_BUDGET_MS: int = 300
+    # Load the cross-encoder in the background once the service is ready, so the first reranked request
+    # isn't spent loading it. Off by default: it loads torch and downloads the model for an opt-in feature
+    RERANK_WARMUP: bool = False
+
+    # "torch" (SentenceTransformer) or "onnx" (int8 graph from export_onnx.py under ONNX_MODEL_PATH)
+    EMBEDDING_BACKEND: str = "torch"
+    ONNX_MODEL_PATH: str = "onnx_model"
+
+    # Micro-batching of query embeddings: concurrent requests share one encode call
+    EMBED_BATCHING: bool = True
+    EMBED_MAX_BATCH: int = 32
+    EMBED_MAX_WAIT_MS: float = 5
+
+    # Open the port immediately and load models and clients in the background; /readyz reports
+    # when the service is warm. Set false to load everything before serving.
+    LAZY_STARTUP: bool = True
+    WARMUP_QUERY: str = "city council budget"
+    # Startup attempts before giving up (and failing /healthz), with exponential backoff in seconds
+    STARTUP_ATTEMPTS: int = 5
+    STARTUP_RETRY_DELAY: float = 1
+    STARTUP_RETRY_MAX_DELAY: float = 30
+
+    # Client pools, timeouts (seconds) and retries
+    OPENAI_MAX_CONNECTIONS: int = 50
+    OPENAI_TIMEOUT: float = 20
+    ENHANCEMENT_TIMEOUT: float = 3
+    SUMMARY_TIMEOUT: float = 15
+    OPENAI_RETRIES: int = 2
+    REDIS_MAX_CONNECTIONS: int = 50
+    REDIS_TIMEOUT: float = 1
+    PINECONE_POOL_THREADS: int = 8
+    PINECONE_POOL_MAXSIZE: int = 16
+    VECTOR_QUERY_TIMEOUT: float = 2
+    VECTOR_HEDGE_MS: int = 150  # start a duplicate vector query if the first is this slow
+    VECTOR_RETRIES: int = 2
+
+    # Skip enhancement and summarization for OPENAI_BREAKER_RESET seconds after this many
+    # consecutive OpenAI failures
+    OPENAI_BREAKER_FAILURES: int = 5
+    OPENAI_BREAKER_RESET: float = 30
+
+    # Diversified search (SearchQuery.diversity / per_meeting_cap): candidates fetched with their
+    # vectors per result, up to a ceiling, for MMR and the per-meeting cap to choose from
+    DIVERSITY_OVERFETCH: int = 4
+    DIVERSITY_MAX_CANDIDATES: int = 200
+
+    # Two-tier cache: per-kind in-process LRU in front of Redis for embeddings, vector results,
+    # enhancements and summaries
+    LOCAL_CACHE_MAX_ENTRIES: int = 2000
+    LOCAL_CACHE_TTL: int = 300
+    EMBEDDING_CACHE_TTL: int = 86400
+    # Kept short: ingestion doesn't invalidate cached vector results
+    SEARCH_CACHE_TTL: int = 300
+
+    # Coalesce identical in-flight enhancement, embedding, vector search and summary calls.
+    # The Redis lock extends this to enhancement and summary LLM calls across replicas.
+    COALESCE_REQUESTS: bool = True
+    COALESCE_REDIS_LOCK: bool = False
+    COALESCE_LOCK_TTL_MS: int = 20000
+    COALESCE_LOCK_WAIT_MS: int = 5000
+
+    # /search/batch: queries per request, and how many run through the pipeline at once
+    BATCH_MAX_QUERIES: int = 50
+    BATCH_CONCURRENCY: int = 16
+
+    # Worker threads for blocking work (embedding, store lookups), and separately for vector
+    # queries, which hedging and retries can run several of per search
+    EXECUTOR_WORKERS: int = 8
+    VECTOR_EXECUTOR_WORKERS: int = 16
+
+    # Speculative search: query the raw text while the LLM enhancement runs, and
+    # fall back to the raw results if enhancement takes longer than the budget
+    SPECULATIVE_SEARCH: bool = True
+    ENHANCEMENT_BUDGET_MS: int = 800
+
+    # Semantic cache for query enhancements (cosine similarity on MiniLM query vectors)
+    SEMANTIC_CACHE_THRESHOLD: float = 0.92
+    SEMANTIC_CACHE_MAX_ENTRIES: int = 5000
+    SEMANTIC_CACHE_TTL: int = 3600
 
     model_config = SettingsConfigDict(
         env_file='.env',
@@ -17,3 +138,8 @@ class Settings(BaseSettings):
     )
 
 settings = Settings()
+
+def search_namespaces() -> set:
+    return {settings.PINECONE_NAMESPACE} | {
+        f"{settings.PINECONE_NAMESPACE}-{layout}" for layout in settings.NAMESPACE_LAYOUTS
+    }
@@ -0,0 +1,115 @@
+"""
+Token-budgeted packing of summary contexts, dropping near-duplicate segments by MMR.
+"""
+
+from dataclasses import replace
+from functools import lru_cache
+from typing import List, Optional, Tuple
+
+import numpy as np
+
+from context_window import MeetingContext, meeting_header, segment_line
+
+SUMMARY_MODEL = "gpt-4o-mini"
+
+# A segment cut shorter than this is more noise than context
+_MIN_TRUNCATED_TOKENS = 48
+
+# English transcript text averages about four characters per token
+_CHARS_PER_TOKEN = 4
+
+# tiktoken fetches the encoding on first use (set TIKTOKEN_CACHE_DIR to ship it with the image);
+# without it, counts fall back to the characters-per-token estimate
+@lru_cache(maxsize=1)
+def _encoding():
+    try:
+        import tiktoken
+        return tiktoken.encoding_for_model(SUMMARY_MODEL)
+    except Exception as e:
+        print(f"Loading tiktoken encoding failed, estimating token counts: {e}")
+        return None
+
+def count_tokens(text: str) -> int:
+    if (encoding := _encoding()) is None:
+        return -(-len(text) // _CHARS_PER_TOKEN)
+    return len(encoding.encode(text, disallowed_special=()))
+
+def truncate_tokens(text: str, max_tokens: int) -> str:
+    if (encoding := _encoding()) is None:
+        if len(text) <= max_tokens * _CHARS_PER_TOKEN:
+            return text
+        return text[:max_tokens * _CHARS_PER_TOKEN].rstrip() + " ..."
+    tokens = encoding.encode(text, disallowed_special=())
+    if len(tokens) <= max_tokens:
+        return text
+    return encoding.decode(tokens[:max_tokens]).rstrip() + " ..."
+
+def pack_contexts(contexts: List[MeetingContext], budget: int, query_vector: Optional[np.ndarray] = None,
+                  segment_vectors: Optional[np.ndarray] = None, mmr_lambda: float = 0.7,
+                  duplicate_threshold: float = 0.95) -> Tuple[List[MeetingContext], dict]:
+    """
+    Fit contexts into `budget` tokens of rendered prompt. segment_vectors holds one L2-normalised row
+    per segment, in context then segment order; without vectors, segments keep their given order
+    and nothing is treated as a duplicate. Returns the packed contexts and stats for the trace.
+    """
+    items = [(meeting, segment) for meeting in contexts for segment in meeting.segments]
+    if not items:
+        return contexts, {"tokens": 0, "segments": 0, "duplicates": 0, "over_budget": 0}
+
+    if segment_vectors is not None and query_vector is not None:
+        vectors = np.asarray(segment_vectors, dtype=np.float32)
+        relevance = vectors @ np.asarray(query_vector, dtype=np.float32)
+        similarity = vectors @ vectors.T
+    else:
+        # Earlier segments come from higher-ranked hits
+        relevance = np.linspace(1.0, 0.0, len(items), dtype=np.float32)
+        similarity = np.zeros((len(items), len(items)), dtype=np.float32)
+
+    # Highest similarity of each candidate to anything already picked
+    redundancy = np.full(len(items), -1.0, dtype=np.float32)
+    open_ = np.ones(len(items), dtype=bool)
+    picked, headers = {}, set()
+    remaining = budget
+    duplicates = over_budget = 0
+
+    while open_.any() and remaining > 0:
+        scores = mmr_lambda * relevance - (1 - mmr_lambda) * np.maximum(redundancy, 0)
+        index = int(np.argmax(np.where(open_, scores, -np.inf)))
+        open_[index] = False
+        if redundancy[index] >= duplicate_threshold:
+            duplicates += 1
+            continue
+
+        meeting, segment = items[index]
+        # Each meeting costs its header and the blank line after it, once
+        header_cost = 0 if id(meeting) in headers else count_tokens(meeting_header(meeting) + "\n")
+        cost = header_cost + count_tokens(segment_line(segment))
+        if cost > remaining:
+            # Cut the segment to fit if enough of it survives; a smaller segment may still fit otherwise
+            room = remaining - header_cost - count_tokens(segment_line(replace(segment, text="")))
+            if room < _MIN_TRUNCATED_TOKENS:
+                over_budget += 1
+                continue
+            # Less a couple of tokens for the " ..." marking the cut
+            segment = replace(segment, text=truncate_tokens(segment.text, room - 2))
+            cost = header_cost + count_tokens(segment_line(segment))
+
+        picked[index] = segment
+        headers.add(id(meeting))
+        remaining -= cost
+        redundancy = np.maximum(redundancy, similarity[index])
+
+    # Regroup the picks by meeting, newest meeting first, in transcript order within each
+    packed = []
+    for meeting in contexts:
+        segments = [picked[i] for i, (owner, _) in enumerate(items) if owner is meeting and i in picked]
+        if segments:
+            packed.append(replace(meeting, segments=sorted(segments, key=lambda segment: segment.start_time)))
+    packed.sort(key=lambda meeting: meeting.meeting_date, reverse=True)
+
+    return packed, {
+        "tokens": budget - remaining,
+        "segments": len(picked),
+        "duplicates": duplicates,
+        "over_budget": over_budget + int(open_.sum())
+    }
@@ -0,0 +1,89 @@
+"""
+Meeting-level summary contexts: top hits widened by their neighbouring chunks, overlapping windows
+merged into contiguous runs, and runs grouped by meeting.
+"""
+
+from dataclasses import dataclass, field
+from typing import Dict, List
+
+from models import SearchResult
+
+# Chunker overlap is at most a few dozen tokens; longer shared runs are left alone
+_MAX_OVERLAP_WORDS = 128
+
+@dataclass
+class Segment:
+    start_time: float
+    end_time: float
+    text: str
+    chunk_ids: List[str]
+
+@dataclass
+class MeetingContext:
+    meeting_title: str
+    meeting_date: str
+    event_id: str
+    segments: List[Segment] = field(default_factory=list)
+
+def strip_overlap(previous: str, text: str) -> str:
+    """Drop the leading words of `text` that repeat the end of `previous` (the chunker's overlap)."""
+    previous_words, words = previous.split(), text.split()
+    for size in range(min(len(previous_words), len(words), _MAX_OVERLAP_WORDS), 0, -1):
+        if previous_words[-size:] == words[:size]:
+            return " ".join(words[size:])
+    return text
+
+def merge_runs(chunks: List[dict]) -> List[Segment]:
+    """Merge one transcript's chunks (any order, duplicates allowed) into contiguous position runs."""
+    by_position = {chunk["position"]: chunk for chunk in chunks}
+    segments, previous = [], None
+    for position in sorted(by_position):
+        chunk = by_position[position]
+        if previous is not None and position == previous + 1:
+            segment = segments[-1]
+            if remainder := strip_overlap(segment.text, chunk["text"]):
+                segment.text = f"{segment.text} {remainder}"
+            segment.end_time = max(segment.end_time, chunk["end_time"])
+            segment.chunk_ids.append(chunk["chunk_id"])
+        else:
+            segments.append(Segment(chunk["start_time"], chunk["end_time"], chunk["text"], [chunk["chunk_id"]]))
+        previous = position
+    return segments
+
+def build_contexts(results: List[SearchResult], neighbours: Dict[str, List[dict]]) -> List[MeetingContext]:
+    """
+    Group results by meeting, in order of each meeting's best hit. Hits with neighbours are replaced
+    by their merged windows; the rest (not expanded, or missing from the store) keep their own text.
+    """
+    contexts: Dict[tuple, MeetingContext] = {}
+    transcript_chunks: Dict[tuple, Dict[str, List[dict]]] = {}
+    for result in results:
+        key = (result.event_id, result.meeting_date, result.meeting_title)
+        if key not in contexts:
+            contexts[key] = MeetingContext(result.meeting_title, result.meeting_date, result.event_id)
+            transcript_chunks[key] = {}
+        if window := neighbours.get(result.chunk_id):
+            transcript_chunks[key].setdefault(window[0]["transcript_id"], []).extend(window)
+
+    for key, context in contexts.items():
+        for chunks in transcript_chunks[key].values():
+            context.segments.extend(merge_runs(chunks))
+
+    covered = {chunk_id for context in contexts.values() for s in context.segments for chunk_id in s.chunk_ids}
+    for result in results:
+        if result.chunk_id not in covered:
+            context = contexts[(result.event_id, result.meeting_date, result.meeting_title)]
+            context.segments.append(
+                Segment(float(result.start_time), float(result.end_time), result.text, [result.chunk_id])
+            )
+            covered.add(result.chunk_id)
+
+    for context in contexts.values():
+        context.segments.sort(key=lambda segment: segment.start_time)
+    return list(contexts.values())
+
+def meeting_header(context: MeetingContext) -> str:
+    return f"Meeting: {context.meeting_title} (Date: {context.meeting_date})\n"
+
+def segment_line(segment: Segment) -> str:
+    return f"Text: {segment.text}\n"
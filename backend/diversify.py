@@ -0,0 +1,71 @@
+"""
+Result diversification for vector search: maximal marginal relevance over the over-fetched candidate
+vectors, with an optional cap on results per meeting. Consecutive chunks of one meeting embed almost
+identically, so without this a popular query can fill top_k from a single session.
+"""
+
+from typing import List, Optional
+
+import numpy as np
+
+from local_index import Match
+
+def meeting_key(metadata: Optional[dict]) -> str:
+    """The meeting a chunk belongs to: its event id, or meeting name and day on records without one."""
+    metadata = metadata or {}
+    if event_id := metadata.get("annotation_event_id"):
+        return str(event_id)
+    return f"{metadata.get('annotation_meeting_name', '')}:{metadata.get('session_day', '')}"
+
+def cap_per_meeting(matches: list, cap: Optional[int]) -> list:
+    """Keep at most `cap` matches per meeting, preserving order."""
+    if not cap:
+        return matches
+    counts, kept = {}, []
+    for match in matches:
+        key = meeting_key(match.metadata)
+        if counts.get(key, 0) < cap:
+            counts[key] = counts.get(key, 0) + 1
+            kept.append(match)
+    return kept
+
+def diversify(matches: list, query_vector: List[float], limit: int, diversity: float = 0.0,
+              per_meeting_cap: Optional[int] = None) -> List[Match]:
+    """
+    Pick up to `limit` matches greedily by MMR: (1 - diversity) * similarity to the query minus
+    diversity * highest similarity to anything already picked. Candidates without .values count
+    as unrelated to everything; those from a meeting that has reached per_meeting_cap are skipped.
+    Returned matches keep their scores, in pick order, without values.
+    """
+    if not matches:
+        return []
+    dimension = len(query_vector)
+    vectors = np.asarray([match.values or [0.0] * dimension for match in matches], dtype=np.float32)
+    vectors = vectors / np.clip(np.linalg.norm(vectors, axis=1, keepdims=True), 1e-12, None)
+    query = np.asarray(query_vector, dtype=np.float32)
+    query = query / max(float(np.linalg.norm(query)), 1e-12)
+
+    relevance = vectors @ query
+    similarity = vectors @ vectors.T
+    meetings = np.asarray([meeting_key(match.metadata) for match in matches])
+
+    diversity = min(max(diversity, 0.0), 1.0)
+    redundancy = np.zeros(len(matches), dtype=np.float32)
+    open_ = np.ones(len(matches), dtype=bool)
+    counts = {}
+    picked = []
+
+    while len(picked) < limit and open_.any():
+        scores = (1 - diversity) * relevance - diversity * redundancy
+        index = int(np.argmax(np.where(open_, scores, -np.inf)))
+        picked.append(index)
+        open_[index] = False
+        redundancy = np.maximum(redundancy, similarity[index])
+
+        if per_meeting_cap:
+            meeting = meetings[index]
+            counts[meeting] = counts.get(meeting, 0) + 1
+            if counts[meeting] >= per_meeting_cap:
+                open_ &= meetings != meeting
+
+    return [Match(id=matches[i].id, score=matches[i].score, metadata=matches[i].metadata) for i in picked]
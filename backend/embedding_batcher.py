@@ -0,0 +1,90 @@
+"""
+Micro-batching for query embeddings. Concurrent requests are collected for up to EMBED_MAX_WAIT_MS
+or EMBED_MAX_BATCH texts and encoded in a single forward pass on a dedicated worker thread,
+instead of many single-string encodes contending for the CPU.
+"""
+
+import asyncio
+from typing import List
+from concurrent.futures import ThreadPoolExecutor
+
+from metrics import Histogram
+
+QUEUE_DEPTH = Histogram(
+    "embedding_queue_depth", "Pending embedding requests seen on enqueue",
+    buckets=(0, 1, 2, 4, 8, 16, 32, 64, 128)
+)
+BATCH_SIZE = Histogram(
+    "embedding_batch_size", "Texts encoded per batched forward pass",
+    buckets=(1, 2, 4, 8, 16, 32, 64)
+)
+
+class EmbeddingBatcher:
+    def __init__(self, model, max_batch: int = 32, max_wait_ms: float = 5):
+        self.model = model
+        self.max_batch = max_batch
+        self.max_wait = max_wait_ms / 1000
+        self._queue = None
+        self._task = None
+        # One thread so batches run back to back; requests arriving meanwhile form the next batch
+        self._worker = ThreadPoolExecutor(max_workers=1, thread_name_prefix="civicly-embed")
+
+    def _encode(self, texts: List[str]) -> List[List[float]]:
+        return self.model.encode(texts, batch_size=len(texts)).tolist()
+
+    async def embed(self, text: str) -> List[float]:
+        if self._task is None:
+            self._queue = asyncio.Queue()
+            self._task = asyncio.create_task(self._run())
+        future = asyncio.get_running_loop().create_future()
+        QUEUE_DEPTH.observe(self._queue.qsize())
+        self._queue.put_nowait((text, future))
+        return await future
+
+    async def _collect(self) -> list:
+        batch = [await self._queue.get()]
+        loop = asyncio.get_running_loop()
+        deadline = loop.time() + self.max_wait
+        while len(batch) < self.max_batch:
+            if not self._queue.empty():
+                batch.append(self._queue.get_nowait())
+                continue
+            timeout = deadline - loop.time()
+            if timeout <= 0:
+                break
+            try:
+                batch.append(await asyncio.wait_for(self._queue.get(), timeout))
+            except asyncio.TimeoutError:
+                break
+        return batch
+
+    async def _run(self):
+        loop = asyncio.get_running_loop()
+        while True:
+            batch = await self._collect()
+            # Requests cancelled while queued don't need encoding
+            batch = [(text, future) for text, future in batch if not future.done()]
+            if not batch:
+                continue
+            BATCH_SIZE.observe(len(batch))
+            try:
+                vectors = await loop.run_in_executor(self._worker, self._encode, [text for text, _ in batch])
+            except Exception as e:
+                print(f"Batched embedding failed: {e}")
+                for _, future in batch:
+                    if not future.done():
+                        future.set_exception(e)
+                continue
+            for (_, future), vector in zip(batch, vectors):
+                if not future.done():
+                    future.set_result(vector)
+
+    async def close(self):
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+        self._worker.shutdown(wait=False, cancel_futures=True)
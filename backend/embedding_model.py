@@ -0,0 +1,64 @@
+"""
+Loads the MiniLM embedding model as a PyTorch SentenceTransformer or an int8 ONNX graph.
+"""
+
+import os
+import numpy as np
+from typing import List, Optional, Union
+
+MODEL_NAME = 'all-MiniLM-L6-v2'
+MAX_SEQ_LENGTH = 256
+
+class OnnxEmbedder:
+    """Stand-in for SentenceTransformer.encode over an exported ONNX graph: mean pooling, then L2 norm."""
+
+    def __init__(self, model_dir: str, threads: Optional[int] = None):
+        import onnxruntime
+        from tokenizers import Tokenizer
+
+        options = onnxruntime.SessionOptions()
+        if threads:
+            options.intra_op_num_threads = threads
+        self.session = onnxruntime.InferenceSession(
+            os.path.join(model_dir, "model_int8.onnx"), options, providers=["CPUExecutionProvider"]
+        )
+        self.input_names = {node.name for node in self.session.get_inputs()}
+        self.tokenizer = Tokenizer.from_file(os.path.join(model_dir, "tokenizer.json"))
+        self.tokenizer.enable_truncation(MAX_SEQ_LENGTH)
+        self.tokenizer.enable_padding()
+
+    def get_sentence_embedding_dimension(self) -> int:
+        return self.session.get_outputs()[0].shape[-1]
+
+    def _encode_batch(self, texts: List[str]) -> np.ndarray:
+        encodings = self.tokenizer.encode_batch(texts)
+        attention_mask = np.array([e.attention_mask for e in encodings], dtype=np.int64)
+        inputs = {
+            "input_ids": np.array([e.ids for e in encodings], dtype=np.int64),
+            "attention_mask": attention_mask,
+            "token_type_ids": np.array([e.type_ids for e in encodings], dtype=np.int64),
+        }
+        hidden = self.session.run(None, {k: v for k, v in inputs.items() if k in self.input_names})[0]
+        mask = attention_mask[..., None].astype(np.float32)
+        pooled = (hidden * mask).sum(axis=1) / np.clip(mask.sum(axis=1), 1e-9, None)
+        return pooled / np.clip(np.linalg.norm(pooled, axis=1, keepdims=True), 1e-12, None)
+
+    def encode(self, texts: Union[str, List[str]], batch_size: int = 32, **kwargs) -> np.ndarray:
+        single = isinstance(texts, str)
+        texts = [texts] if single else list(texts)
+        embeddings = np.empty((len(texts), self.get_sentence_embedding_dimension()), dtype=np.float32)
+        for start in range(0, len(texts), batch_size):
+            embeddings[start:start + batch_size] = self._encode_batch(texts[start:start + batch_size])
+        return embeddings[0] if single else embeddings
+
+def load_embedding_model(backend: str = "torch", onnx_path: str = "onnx_model", threads: Optional[int] = None):
+    """Return an object with SentenceTransformer's encode() for the selected backend ("torch" or "onnx")."""
+    if backend == "onnx":
+        return OnnxEmbedder(onnx_path, threads=threads)
+    if backend != "torch":
+        raise ValueError(f"Unknown EMBEDDING_BACKEND: {backend}")
+    from sentence_transformers import SentenceTransformer
+    if threads:
+        import torch
+        torch.set_num_threads(threads)
+    return SentenceTransformer(MODEL_NAME)
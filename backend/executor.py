@@ -0,0 +1,40 @@
+"""
+Bounded thread pools for blocking work so it stays off the event loop: one shared pool for model
+inference and store lookups, and a separate one for vector queries, whose hedged and timed-out calls
+keep running in their threads and must not crowd out everything else.
+"""
+
+import asyncio
+import functools
+import contextvars
+from concurrent.futures import ThreadPoolExecutor
+
+from config import settings
+
+_executor = ThreadPoolExecutor(
+    max_workers=settings.EXECUTOR_WORKERS,
+    thread_name_prefix="civicly-blocking"
+)
+
+_vector_executor = ThreadPoolExecutor(
+    max_workers=settings.VECTOR_EXECUTOR_WORKERS,
+    thread_name_prefix="civicly-vector"
+)
+
+async def _run(pool: ThreadPoolExecutor, func, *args, **kwargs):
+    loop = asyncio.get_running_loop()
+    # Carry context variables (the request trace) into the worker thread, as asyncio.to_thread does
+    context = contextvars.copy_context()
+    return await loop.run_in_executor(pool, functools.partial(context.run, func, *args, **kwargs))
+
+async def run_blocking(func, *args, **kwargs):
+    """Run a blocking callable on the shared executor and await its result."""
+    return await _run(_executor, func, *args, **kwargs)
+
+async def run_vector_query(func, *args, **kwargs):
+    """Run a blocking vector index query on the vector query executor and await its result."""
+    return await _run(_vector_executor, func, *args, **kwargs)
+
+def shutdown():
+    _executor.shutdown(wait=False, cancel_futures=True)
+    _vector_executor.shutdown(wait=False, cancel_futures=True)
@@ -0,0 +1,54 @@
+""" Export all-MiniLM-L6-v2 to ONNX and quantize it to int8 for EMBEDDING_BACKEND=onnx.
+
+Writes model.onnx, model_int8.onnx and tokenizer.json to the output directory.
+Check the result with check_onnx_parity.py before pointing ONNX_MODEL_PATH at it.
+
+Usage: python export_onnx.py [--output onnx_model]
+"""
+
+import os
+import argparse
+
+import torch
+from onnxruntime.quantization import quantize_dynamic, QuantType
+from sentence_transformers import SentenceTransformer
+
+from embedding_model import MODEL_NAME, MAX_SEQ_LENGTH
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--output", default="onnx_model")
+    parser.add_argument("--opset", type=int, default=17)
+    args = parser.parse_args()
+    os.makedirs(args.output, exist_ok=True)
+
+    model = SentenceTransformer(MODEL_NAME, device="cpu")
+    transformer = model[0].auto_model.eval()
+    tokenizer = model.tokenizer
+    tokenizer.save_pretrained(args.output)  # writes tokenizer.json for the `tokenizers` runtime
+
+    sample = tokenizer(["sample council transcript text"], return_tensors="pt",
+                       padding=True, truncation=True, max_length=MAX_SEQ_LENGTH)
+    input_names = ["input_ids", "attention_mask", "token_type_ids"]
+    dynamic_axes = {name: {0: "batch", 1: "sequence"} for name in input_names}
+    dynamic_axes["last_hidden_state"] = {0: "batch", 1: "sequence"}
+
+    fp32_path = os.path.join(args.output, "model.onnx")
+    with torch.no_grad():
+        torch.onnx.export(
+            transformer,
+            tuple(sample[name] for name in input_names),
+            fp32_path,
+            input_names=input_names,
+            output_names=["last_hidden_state"],
+            dynamic_axes=dynamic_axes,
+            opset_version=args.opset
+        )
+
+    int8_path = os.path.join(args.output, "model_int8.onnx")
+    quantize_dynamic(fp32_path, int8_path, weight_type=QuantType.QInt8)
+    for path in (fp32_path, int8_path):
+        print(f"{path}: {os.path.getsize(path) / 1e6:.1f} MB")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,226 @@
+"""
+Compact BM25 inverted index over chunk text, persisted as a compacted .npz plus an append-only log.
+"""
+
+import os
+import re
+import json
+import math
+import threading
+import numpy as np
+from array import array
+from collections import Counter
+from typing import List, Tuple
+
+_TOKEN = re.compile(r"[a-z0-9]+")
+
+STOPWORDS = frozenset("""
+a about an and are as at be been but by can do for from has have i if in into is it its me my
+of on or our so that the their them there these they this to was we were what when where which
+who will with would you your
+""".split())
+
+def tokenize(text: str) -> List[str]:
+    return [token for token in _TOKEN.findall(text.lower()) if token not in STOPWORDS]
+
+class KeywordIndex:
+    def __init__(self, root: str, namespace: str, k1: float = 1.2, b: float = 0.75):
+        self.root = root
+        self.namespace = namespace
+        self.k1 = k1
+        self.b = b
+        self._lock = threading.Lock()
+        self._reset()
+        self._load()
+
+    @property
+    def _npz_path(self) -> str:
+        return os.path.join(self.root, f"{self.namespace}.npz")
+
+    @property
+    def _log_path(self) -> str:
+        return os.path.join(self.root, f"{self.namespace}.log")
+
+    def _reset(self):
+        self.ids = []
+        self.positions = {}
+        self.lengths = array("f")
+        self.alive = bytearray()
+        self.postings = {}  # term -> (doc numbers, term frequencies)
+        self._pending = []
+        self._log_offset = 0
+        self._npz_mtime = None
+
+    def _load(self):
+        if os.path.exists(self._npz_path):
+            self._npz_mtime = os.path.getmtime(self._npz_path)
+            data = np.load(self._npz_path)
+            self.ids = data["ids"].tolist()
+            self.positions = {chunk_id: doc for doc, chunk_id in enumerate(self.ids)}
+            self.lengths = array("f", data["lengths"].tobytes())
+            self.alive = bytearray(b"\x01" * len(self.ids))
+            offsets, docs, tfs = data["offsets"], data["docs"], data["tfs"]
+            for i, term in enumerate(data["vocab"].tolist()):
+                start, end = offsets[i], offsets[i + 1]
+                self.postings[term] = (array("i", docs[start:end].tobytes()), array("f", tfs[start:end].tobytes()))
+        self._replay_log()
+
+    def _replay_log(self):
+        if not os.path.exists(self._log_path):
+            return
+        with open(self._log_path, "rb") as f:
+            f.seek(self._log_offset)
+            for line in f:
+                if not line.endswith(b"\n"):
+                    break
+                self._log_offset += len(line)
+                record = json.loads(line)
+                if record.get("deleted"):
+                    self._delete_doc(record["id"])
+                else:
+                    self._add_doc(record["id"], record["terms"], record["length"])
+
+    def refresh(self):
+        """Pick up documents another process added; reload entirely after a compaction."""
+        with self._lock:
+            npz_mtime = os.path.getmtime(self._npz_path) if os.path.exists(self._npz_path) else None
+            log_size = os.path.getsize(self._log_path) if os.path.exists(self._log_path) else 0
+            if npz_mtime != self._npz_mtime or log_size < self._log_offset:
+                self._reset()
+                self._load()
+            elif log_size > self._log_offset:
+                self._replay_log()
+
+    def _add_doc(self, chunk_id: str, term_counts: dict, length: int):
+        self._delete_doc(chunk_id)
+        doc = len(self.ids)
+        self.ids.append(chunk_id)
+        self.positions[chunk_id] = doc
+        self.lengths.append(length)
+        self.alive.append(1)
+        for term, tf in term_counts.items():
+            docs, tfs = self.postings.setdefault(term, (array("i"), array("f")))
+            docs.append(doc)
+            tfs.append(tf)
+
+    def _delete_doc(self, chunk_id: str):
+        if (doc := self.positions.pop(chunk_id, None)) is not None:
+            self.alive[doc] = 0
+
+    def add(self, chunk_id: str, text: str):
+        tokens = tokenize(text)
+        record = {"id": chunk_id, "terms": dict(Counter(tokens)), "length": len(tokens)}
+        with self._lock:
+            self._pending.append(record)
+            self._add_doc(chunk_id, record["terms"], record["length"])
+
+    def delete(self, chunk_ids: List[str]):
+        with self._lock:
+            for chunk_id in chunk_ids:
+                self._pending.append({"id": chunk_id, "deleted": True})
+                self._delete_doc(chunk_id)
+
+    def flush(self):
+        """Append pending additions and deletions to the log."""
+        with self._lock:
+            if not self._pending:
+                return
+            os.makedirs(self.root, exist_ok=True)
+            data = "".join(json.dumps(record) + "\n" for record in self._pending).encode()
+            with open(self._log_path, "ab") as f:
+                f.write(data)
+            self._log_offset += len(data)
+            self._pending = []
+
+    def compact(self):
+        """Rewrite live documents into the npz and empty the log."""
+        self.flush()
+        with self._lock:
+            alive = np.frombuffer(bytes(self.alive), dtype=np.uint8).astype(bool)
+            remap = np.cumsum(alive) - 1
+            vocab, offsets, all_docs, all_tfs = [], [0], [], []
+            for term, (docs, tfs) in self.postings.items():
+                docs = np.frombuffer(docs, dtype=np.int32)
+                keep = alive[docs]
+                if not keep.any():
+                    continue
+                vocab.append(term)
+                all_docs.append(remap[docs[keep]].astype(np.int32))
+                all_tfs.append(np.frombuffer(tfs, dtype=np.float32)[keep])
+                offsets.append(offsets[-1] + int(keep.sum()))
+
+            os.makedirs(self.root, exist_ok=True)
+            tmp_path = self._npz_path + ".tmp.npz"
+            np.savez(
+                tmp_path,
+                vocab=np.array(vocab, dtype=str),
+                offsets=np.array(offsets, dtype=np.int64),
+                docs=np.concatenate(all_docs) if all_docs else np.empty(0, dtype=np.int32),
+                tfs=np.concatenate(all_tfs) if all_tfs else np.empty(0, dtype=np.float32),
+                lengths=np.frombuffer(self.lengths, dtype=np.float32)[alive],
+                ids=np.array([chunk_id for chunk_id, live in zip(self.ids, alive) if live], dtype=str)
+            )
+            os.replace(tmp_path, self._npz_path)
+            open(self._log_path, "w").close()
+        self._reset()
+        self._load()
+
+    def search(self, query: str, top_k: int = 10) -> List[Tuple[str, float]]:
+        """BM25 top_k as (chunk_id, score), best first."""
+        self.refresh()
+        with self._lock:
+            terms = [term for term in set(tokenize(query)) if term in self.postings]
+            if not terms or not self.positions:
+                return []
+
+            alive = np.frombuffer(bytes(self.alive), dtype=np.uint8).astype(bool)
+            lengths = np.frombuffer(self.lengths, dtype=np.float32)
+            n_docs = len(self.positions)
+            avg_length = float(lengths[alive].mean()) or 1.0
+
+            scores = np.zeros(len(self.ids), dtype=np.float32)
+            for term in terms:
+                docs, tfs = self.postings[term]
+                docs = np.frombuffer(docs, dtype=np.int32)
+                tfs = np.frombuffer(tfs, dtype=np.float32)
+                df = int(alive[docs].sum())
+                idf = math.log(1 + (n_docs - df + 0.5) / (df + 0.5))
+                norm = self.k1 * (1 - self.b + self.b * lengths[docs] / avg_length)
+                scores[docs] += idf * tfs * (self.k1 + 1) / (tfs + norm)
+            scores[~alive] = 0
+
+            candidates = np.flatnonzero(scores)
+            if len(candidates) > top_k:
+                candidates = candidates[np.argpartition(-scores[candidates], top_k - 1)[:top_k]]
+            candidates = candidates[np.argsort(-scores[candidates], kind="stable")]
+            return [(self.ids[doc], float(scores[doc])) for doc in candidates]
+
+_QUOTED = re.compile(r'"[^"]+"')
+# Long numbers, and bill, file, resolution and ordinance numbers (CB 120345, Res. 32012, CF 314441)
+_IDENTIFIER = re.compile(
+    r"\d{5,}|\b(?:CB|CF|Council Bill|Clerk File|Bill|File|Res|Resolution|Ord|Ordinance)\.?\s*(?:No\.?\s*)?#?\d{3,}\b",
+    re.IGNORECASE
+)
+_ACRONYM = re.compile(r"\b[A-Z]{2,}\b")
+_WORD = re.compile(r"[A-Za-z][\w'-]*")
+
+def is_keyword_query(query: str) -> bool:
+    """
+    Heuristic for queries that name something exactly: quoted phrases, bill and file numbers,
+    acronyms (SDOT), or a run of two or more capitalised words alongside lowercase ones ("traffic
+    on Aurora Avenue"). Queries that are capitalised throughout ("Budget", "Bike Lanes") are
+    title case or keyboard auto-capitalisation, not evidence of a name.
+    """
+    if _QUOTED.search(query) or _IDENTIFIER.search(query):
+        return True
+    if query != query.upper() and _ACRONYM.search(query):
+        return True
+    words = _WORD.findall(query)
+    if not any(word.islower() for word in words):
+        return False
+    run = 0
+    for word in words:
+        run = run + 1 if word[0].isupper() else 0
+        if run >= 2:
+            return True
+    return False
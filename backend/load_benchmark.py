@@ -0,0 +1,132 @@
+""" Load benchmark for the search path against local stand-ins for OpenAI, Redis, Pinecone and the embedding model.
+
+Usage: python load_benchmark.py [--requests 20] [--concurrency 1 4 16 64] [--compare-blocking]
+"""
+
+import os
+import time
+import asyncio
+import argparse
+from types import SimpleNamespace
+
+import numpy as np
+
+os.environ.setdefault("OPENAI_API_KEY", "benchmark")
+os.environ.setdefault("PINECONE_API_KEY", "benchmark")
+
+from models import SearchQuery
+from search_service import SearchService
+from vector_store import VectorStore
+
+LLM_LATENCY = 0.25
+EMBED_LATENCY = 0.01
+INDEX_LATENCY = 0.05
+
+class StubCompletions:
+    def __init__(self, blocking: bool):
+        self.blocking = blocking
+
+    async def create(self, **kwargs):
+        if self.blocking:
+            # Mimics the old synchronous client being called from a coroutine
+            time.sleep(LLM_LATENCY)
+        else:
+            await asyncio.sleep(LLM_LATENCY)
+        message = SimpleNamespace(content="stub completion")
+        return SimpleNamespace(choices=[SimpleNamespace(message=message)])
+
+class StubOpenAI:
+    def __init__(self, blocking: bool = False):
+        self.chat = SimpleNamespace(completions=StubCompletions(blocking))
+
+    async def close(self):
+        pass
+
+class StubRedis:
+    """Always misses so every request pays for the full pipeline."""
+    async def get(self, key):
+        return None
+
+    async def setex(self, key, ttl, value):
+        pass
+
+    async def aclose(self):
+        pass
+
+class StubModel:
+    def encode(self, text, batch_size=None):
+        time.sleep(EMBED_LATENCY)
+        if isinstance(text, list):
+            return np.zeros((len(text), 384), dtype=np.float32)
+        return np.zeros(384, dtype=np.float32)
+
+class StubIndex:
+    def query(self, namespace, vector, top_k, include_metadata=True, **kwargs):
+        time.sleep(INDEX_LATENCY)
+        metadata = {
+            "annotation_event_id": "event",
+            "text": "stub transcript text",
+            "session_date": "2024-01-01T00:00:00",
+            "annotation_meeting_name": "City Council",
+            "speaker": "Speaker 1",
+            "start_time": "0.0",
+            "end_time": "1.0",
+        }
+        matches = [
+            SimpleNamespace(id=f"chunk_{i}", score=1.0 - i / top_k, metadata=metadata)
+            for i in range(top_k)
+        ]
+        return SimpleNamespace(matches=matches)
+
+def _percentile(sorted_values, pct):
+    index = min(len(sorted_values) - 1, int(round(pct / 100 * (len(sorted_values) - 1))))
+    return sorted_values[index]
+
+async def _run_level(service: SearchService, concurrency: int, requests_per_client: int):
+    latencies = []
+
+    async def client(client_id: int):
+        for i in range(requests_per_client):
+            start = time.perf_counter()
+            await service.search(SearchQuery(query=f"query {client_id} {i}"))
+            latencies.append(time.perf_counter() - start)
+
+    start = time.perf_counter()
+    await asyncio.gather(*(client(c) for c in range(concurrency)))
+    elapsed = time.perf_counter() - start
+
+    latencies.sort()
+    return {
+        "p50": _percentile(latencies, 50) * 1000,
+        "p99": _percentile(latencies, 99) * 1000,
+        "rps": len(latencies) / elapsed,
+    }
+
+async def run(levels, requests_per_client: int, blocking: bool):
+    service = SearchService(
+        vector_store=VectorStore(index=StubIndex(), model=StubModel()),
+        redis_client=StubRedis(),
+        openai_client=StubOpenAI(blocking=blocking)
+    )
+
+    label = "blocking openai stand-in" if blocking else "async path"
+    print(f"\n=== {label} ===")
+    print(f"{'concurrency':>12} {'p50 (ms)':>10} {'p99 (ms)':>10} {'req/s':>8}")
+    for concurrency in levels:
+        stats = await _run_level(service, concurrency, requests_per_client)
+        print(f"{concurrency:>12} {stats['p50']:>10.1f} {stats['p99']:>10.1f} {stats['rps']:>8.1f}")
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--requests", type=int, default=20, help="requests per simulated client")
+    parser.add_argument("--concurrency", type=int, nargs="+", default=[1, 4, 16, 64])
+    parser.add_argument("--compare-blocking", action="store_true",
+                        help="also run with an OpenAI stand-in that blocks the event loop")
+    args = parser.parse_args()
+
+    asyncio.run(run(args.concurrency, args.requests, blocking=False))
+    if args.compare_blocking:
+        asyncio.run(run(args.concurrency, args.requests, blocking=True))
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,391 @@
+"""
+Local, file-backed vector index exposing the subset of the Pinecone Index API the app uses.
+"""
+
+import os
+import json
+import threading
+import numpy as np
+from dataclasses import dataclass
+from typing import Optional
+
+BLOCK_ROWS = 8192
+
+@dataclass
+class Match:
+    id: str
+    score: float
+    metadata: Optional[dict] = None
+    values: Optional[list] = None
+
+@dataclass
+class QueryResponse:
+    matches: list
+    namespace: str
+
+@dataclass
+class Vector:
+    id: str
+    values: list
+    metadata: Optional[dict] = None
+
+@dataclass
+class FetchResponse:
+    vectors: dict
+    namespace: str
+
+class _Column:
+    """Vectorised view of one metadata field for filter evaluation."""
+
+    def __init__(self, values: list):
+        present = [v for v in values if v is not None]
+        if any(isinstance(v, list) for v in present):
+            self.kind = "multi"
+            self.sets = [set(v) if isinstance(v, list) else ({v} if v is not None else set()) for v in values]
+        elif present and all(isinstance(v, (int, float)) and not isinstance(v, bool) for v in present):
+            self.kind = "numeric"
+            self.array = np.array([np.nan if v is None else v for v in values], dtype=np.float64)
+        else:
+            self.kind = "categorical"
+            self.vocab = {}
+            self.codes = np.array(
+                [-1 if v is None else self.vocab.setdefault(v, len(self.vocab)) for v in values],
+                dtype=np.int32
+            )
+        self.present = np.array([v is not None for v in values], dtype=bool)
+
+    def match(self, op: str, value) -> np.ndarray:
+        if op == "$exists":
+            return self.present if value else ~self.present
+        if op == "$ne":
+            return ~self.match("$eq", value)
+        if op == "$nin":
+            return ~self.match("$in", value)
+
+        if self.kind == "multi":
+            wanted = set(value) if op == "$in" else {value}
+            if op not in ("$eq", "$in"):
+                raise ValueError(f"Operator {op} is not supported on list fields")
+            return np.fromiter((not row.isdisjoint(wanted) for row in self.sets), dtype=bool, count=len(self.sets))
+
+        if self.kind == "numeric":
+            if op == "$eq":
+                return self.array == value if isinstance(value, (int, float)) else np.zeros(len(self.array), dtype=bool)
+            if op == "$in":
+                return np.isin(self.array, [v for v in value if isinstance(v, (int, float))])
+            with np.errstate(invalid="ignore"):
+                if op == "$gt":
+                    return self.array > value
+                if op == "$gte":
+                    return self.array >= value
+                if op == "$lt":
+                    return self.array < value
+                if op == "$lte":
+                    return self.array <= value
+            raise ValueError(f"Unsupported filter operator {op}")
+
+        if op == "$eq":
+            return self.codes == self.vocab.get(value, -2)
+        if op == "$in":
+            return np.isin(self.codes, [self.vocab[v] for v in value if v in self.vocab])
+        raise ValueError(f"Operator {op} is only supported on numeric fields")
+
+class _Namespace:
+    def __init__(self, path: str, dtype: str):
+        self.path = path
+        self.dtype = np.dtype(dtype)
+        self.dim = None
+        self.vectors = None
+        self.ids = []
+        self.metadata = []
+        self.alive = np.zeros(0, dtype=bool)
+        self.positions = {}
+        self.ivf = None
+        self._meta_offset = 0
+        self._columns = {}
+        self._load_info()
+        self._load_ivf()
+
+    @property
+    def rows(self) -> int:
+        return len(self.ids)
+
+    def _file(self, name: str) -> str:
+        return os.path.join(self.path, name)
+
+    def _load_info(self):
+        if os.path.exists(self._file("info.json")):
+            with open(self._file("info.json")) as f:
+                info = json.load(f)
+            self.dim = info["dim"]
+            self.dtype = np.dtype(info["dtype"])
+
+    def _load_ivf(self):
+        if os.path.exists(self._file("ivf.npz")):
+            data = np.load(self._file("ivf.npz"))
+            self.ivf = {key: data[key] for key in data.files}
+
+    def refresh(self):
+        """Pick up rows appended since the last read, by this or another process."""
+        meta_path = self._file("metadata.jsonl")
+        if self.dim is None:
+            self._load_info()
+        if self.dim is None or not os.path.exists(meta_path):
+            return
+        if os.path.getsize(meta_path) == self._meta_offset:
+            return
+
+        alive = list(self.alive)
+        with open(meta_path, "rb") as f:
+            f.seek(self._meta_offset)
+            for line in f:
+                if not line.endswith(b"\n"):
+                    break  # partially written line from an interrupted writer
+                self._meta_offset += len(line)
+                record = json.loads(line)
+                row = len(self.ids)
+                if (previous := self.positions.get(record["id"])) is not None:
+                    alive[previous] = False
+                self.ids.append(record["id"])
+                self.metadata.append(record.get("metadata"))
+                if record.get("deleted"):
+                    self.positions.pop(record["id"], None)
+                    alive.append(False)
+                else:
+                    self.positions[record["id"]] = row
+                    alive.append(True)
+
+        self.alive = np.array(alive, dtype=bool)
+        self._columns = {}
+        self.vectors = np.memmap(self._file("vectors.bin"), dtype=self.dtype, mode="r", shape=(self.rows, self.dim))
+
+    def append(self, records: list):
+        """Append (id, unit vector or None for a tombstone, metadata) records."""
+        if not records:
+            return
+        os.makedirs(self.path, exist_ok=True)
+        if self.dim is None:
+            dim = next(len(vector) for _, vector, _ in records if vector is not None)
+            with open(self._file("info.json"), "w") as f:
+                json.dump({"dim": dim, "dtype": self.dtype.name}, f)
+            self.dim = dim
+
+        # Drop any tail left by an interrupted writer so vectors and metadata stay aligned
+        vec_path, meta_path = self._file("vectors.bin"), self._file("metadata.jsonl")
+        row_bytes = self.dim * self.dtype.itemsize
+        for path, size in ((vec_path, self.rows * row_bytes), (meta_path, self._meta_offset)):
+            if os.path.exists(path) and os.path.getsize(path) != size:
+                os.truncate(path, size)
+
+        block = np.zeros((len(records), self.dim), dtype=self.dtype)
+        lines = []
+        for i, (vector_id, vector, metadata) in enumerate(records):
+            if vector is None:
+                lines.append(json.dumps({"id": vector_id, "deleted": True}))
+            else:
+                block[i] = vector
+                lines.append(json.dumps({"id": vector_id, "metadata": metadata}))
+
+        with open(vec_path, "ab") as f:
+            f.write(block.tobytes())
+        with open(meta_path, "a") as f:
+            f.write("\n".join(lines) + "\n")
+        self.refresh()
+
+    def column(self, field: str) -> _Column:
+        if field not in self._columns:
+            self._columns[field] = _Column([(m or {}).get(field) for m in self.metadata])
+        return self._columns[field]
+
+    def filter_mask(self, metadata_filter: dict) -> np.ndarray:
+        mask = np.ones(self.rows, dtype=bool)
+        for key, condition in metadata_filter.items():
+            if key == "$and":
+                for clause in condition:
+                    mask &= self.filter_mask(clause)
+            elif key == "$or":
+                either = np.zeros(self.rows, dtype=bool)
+                for clause in condition:
+                    either |= self.filter_mask(clause)
+                mask &= either
+            else:
+                if not isinstance(condition, dict):
+                    condition = {"$eq": condition}
+                column = self.column(key)
+                for op, value in condition.items():
+                    mask &= column.match(op, value)
+        return mask
+
+def _unit_rows(vectors) -> np.ndarray:
+    matrix = np.atleast_2d(np.asarray(vectors, dtype=np.float32))
+    norms = np.linalg.norm(matrix, axis=1, keepdims=True)
+    norms[norms == 0] = 1.0
+    return matrix / norms
+
+def _top_k(scores: np.ndarray, rows: np.ndarray, k: int):
+    if len(scores) > k:
+        keep = np.argpartition(-scores, k - 1)[:k]
+        scores, rows = scores[keep], rows[keep]
+    order = np.argsort(-scores, kind="stable")
+    return scores[order], rows[order]
+
+class LocalIndex:
+    def __init__(self, path: str, dtype: str = "float32", search: str = "exact", nprobe: int = 8):
+        self.path = path
+        self.dtype = dtype
+        self.search = search
+        self.nprobe = nprobe
+        self._namespaces = {}
+        self._lock = threading.Lock()
+
+    def _namespace(self, namespace: str) -> _Namespace:
+        with self._lock:
+            if namespace not in self._namespaces:
+                self._namespaces[namespace] = _Namespace(os.path.join(self.path, namespace), self.dtype)
+            ns = self._namespaces[namespace]
+            ns.refresh()
+            return ns
+
+    def upsert(self, vectors: list, namespace: str = ""):
+        records = []
+        for vector in vectors:
+            if isinstance(vector, dict):
+                vector_id, values, metadata = vector["id"], vector["values"], vector.get("metadata")
+            else:
+                vector_id, values, metadata = vector[0], vector[1], (vector[2] if len(vector) > 2 else None)
+            records.append((vector_id, _unit_rows(values)[0], metadata))
+
+        ns = self._namespace(namespace)
+        with self._lock:
+            ns.append(records)
+        return {"upserted_count": len(records)}
+
+    def delete(self, ids: list, namespace: str = ""):
+        ns = self._namespace(namespace)
+        with self._lock:
+            ns.append([(vector_id, None, None) for vector_id in ids if vector_id in ns.positions])
+
+    def update(self, id: str, values: Optional[list] = None, set_metadata: Optional[dict] = None,
+               namespace: str = ""):
+        ns = self._namespace(namespace)
+        row = ns.positions[id]
+        metadata = {**(ns.metadata[row] or {}), **(set_metadata or {})}
+        vector = _unit_rows(values)[0] if values is not None else np.asarray(ns.vectors[row], dtype=np.float32)
+        with self._lock:
+            ns.append([(id, vector, metadata)])
+
+    def fetch(self, ids: list, namespace: str = "") -> FetchResponse:
+        ns = self._namespace(namespace)
+        vectors = {}
+        for vector_id in ids:
+            if (row := ns.positions.get(vector_id)) is not None:
+                vectors[vector_id] = Vector(
+                    id=vector_id,
+                    values=ns.vectors[row].astype(np.float32).tolist(),
+                    metadata=ns.metadata[row]
+                )
+        return FetchResponse(vectors=vectors, namespace=namespace)
+
+    def list(self, namespace: str = "", prefix: Optional[str] = None, limit: int = 100):
+        """Yield pages of live ids, like the Pinecone serverless list generator."""
+        ns = self._namespace(namespace)
+        ids = [vector_id for vector_id in ns.positions if prefix is None or vector_id.startswith(prefix)]
+        for start in range(0, len(ids), limit):
+            yield ids[start:start + limit]
+
+    def _candidates(self, ns: _Namespace, vector: np.ndarray, n_rows: int):
+        """Row ranges to score: everything for exact search, probed IVF lists plus the unclustered tail otherwise."""
+        if self.search != "ivf" or ns.ivf is None:
+            return [np.arange(start, min(start + BLOCK_ROWS, n_rows)) for start in range(0, n_rows, BLOCK_ROWS)]
+
+        ivf = ns.ivf
+        nprobe = min(self.nprobe, len(ivf["centroids"]))
+        probes = np.argpartition(-(ivf["centroids"] @ vector), nprobe - 1)[:nprobe]
+        offsets = ivf["offsets"]
+        rows = np.concatenate(
+            [ivf["order"][offsets[c]:offsets[c + 1]] for c in probes]
+            + [np.arange(int(ivf["rows"]), n_rows)]
+        )
+        return [np.sort(rows[start:start + BLOCK_ROWS]) for start in range(0, len(rows), BLOCK_ROWS)]
+
+    def query(self, vector: list, top_k: int = 10, namespace: str = "", filter: Optional[dict] = None,
+              include_metadata: bool = False, include_values: bool = False, **kwargs) -> QueryResponse:
+        ns = self._namespace(namespace)
+        if ns.rows == 0:
+            return QueryResponse(matches=[], namespace=namespace)
+
+        query_vector = _unit_rows(vector)[0]
+        # Snapshot the row count so a concurrent append can't change lengths mid-query
+        alive = ns.alive
+        allowed = alive & ns.filter_mask(filter)[:len(alive)] if filter else alive
+
+        best_scores, best_rows = np.empty(0, dtype=np.float32), np.empty(0, dtype=np.int64)
+        for rows in self._candidates(ns, query_vector, len(alive)):
+            rows = rows[allowed[rows]]
+            if not len(rows):
+                continue
+            contiguous = rows[-1] - rows[0] + 1 == len(rows)
+            block = ns.vectors[rows[0]:rows[-1] + 1] if contiguous else ns.vectors[rows]
+            scores = np.asarray(block, dtype=np.float32) @ query_vector
+            best_scores, best_rows = _top_k(
+                np.concatenate([best_scores, scores]), np.concatenate([best_rows, rows]), top_k
+            )
+
+        matches = [
+            Match(
+                id=ns.ids[row],
+                score=float(score),
+                metadata=ns.metadata[row] if include_metadata else None,
+                values=ns.vectors[row].astype(np.float32).tolist() if include_values else None
+            )
+            for score, row in zip(best_scores, best_rows)
+        ]
+        return QueryResponse(matches=matches, namespace=namespace)
+
+    def build_ivf(self, namespace: str = "", nlist: Optional[int] = None, iterations: int = 10, seed: int = 0):
+        """Cluster the namespace with spherical k-means and store inverted lists for IVF search."""
+        ns = self._namespace(namespace)
+        live_rows = np.flatnonzero(ns.alive)
+        if not len(live_rows):
+            return
+        nlist = min(nlist or max(1, int(4 * np.sqrt(len(live_rows)))), len(live_rows))
+        rng = np.random.default_rng(seed)
+
+        sample_rows = np.sort(rng.choice(live_rows, size=min(len(live_rows), nlist * 64), replace=False))
+        sample = np.asarray(ns.vectors[sample_rows], dtype=np.float32)
+        centroids = sample[rng.choice(len(sample), size=nlist, replace=False)]
+        for _ in range(iterations):
+            assignment = np.argmax(sample @ centroids.T, axis=1)
+            sums = np.zeros_like(centroids)
+            np.add.at(sums, assignment, sample)
+            occupied = np.bincount(assignment, minlength=nlist) > 0
+            centroids[occupied] = _unit_rows(sums[occupied])
+
+        assignment = np.empty(ns.rows, dtype=np.int32)
+        for start in range(0, ns.rows, BLOCK_ROWS):
+            block = np.asarray(ns.vectors[start:start + BLOCK_ROWS], dtype=np.float32)
+            assignment[start:start + len(block)] = np.argmax(block @ centroids.T, axis=1)
+
+        order = np.argsort(assignment, kind="stable").astype(np.int64)
+        offsets = np.concatenate([[0], np.cumsum(np.bincount(assignment, minlength=nlist))]).astype(np.int64)
+        ivf = {"centroids": centroids, "order": order, "offsets": offsets, "rows": np.int64(ns.rows)}
+        np.savez(os.path.join(ns.path, "ivf.npz"), **ivf)
+        with self._lock:
+            ns.ivf = ivf
+
+    def compact(self, namespace: str = ""):
+        """Rewrite the namespace keeping only live rows; drops any IVF lists."""
+        ns = self._namespace(namespace)
+        live_rows = np.flatnonzero(ns.alive)
+        records = [
+            (ns.ids[row], np.asarray(ns.vectors[row], dtype=np.float32), ns.metadata[row])
+            for row in live_rows
+        ]
+        with self._lock:
+            for name in ("vectors.bin", "metadata.jsonl", "ivf.npz"):
+                if os.path.exists(ns._file(name)):
+                    os.remove(ns._file(name))
+            fresh = _Namespace(ns.path, self.dtype)
+            if records:
+                fresh.append(records)
+            self._namespaces[namespace] = fresh
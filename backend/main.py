@@ -2,23 +2,122 @@
 Backend API entrypoint, defines endpoints and handles HTTP requests.
 """
 
-from fastapi import FastAPI
+import time
+_process_start = time.perf_counter()
+
+import json
+import asyncio
+from fastapi import FastAPI, HTTPException
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.responses import StreamingResponse, PlainTextResponse, JSONResponse
 from contextlib import asynccontextmanager
 
-from models import SearchQuery, SearchResponse
-from search_service import SearchService
+# search_service (torch, sentence-transformers, Pinecone, OpenAI) is imported by _load_service
+from models import SearchQuery, SearchResponse, BatchSearchQuery, BatchSearchResponse
 from config import settings
+import executor
+from context_packer import count_tokens
+import metrics
+
+STARTUP_SECONDS = metrics.Gauge(
+    "startup_seconds",
+    "Startup phases in seconds: app_import, service_import, service_init, warmup, ready, first_query"
+)
+STARTUP_SECONDS.set(time.perf_counter() - _process_start, phase="app_import")
 
 search_service = None
+startup_error = None
+_reranker_warmup = None
+_first_query_done = False
+
+def _build_service():
+    start = time.perf_counter()
+    from search_service import SearchService
+    STARTUP_SECONDS.set(time.perf_counter() - start, phase="service_import")
+
+    start = time.perf_counter()
+    service = SearchService()
+    STARTUP_SECONDS.set(time.perf_counter() - start, phase="service_init")
+    return service
+
+async def _load_service():
+    """
+    Import and build the search service off the event loop, then warm the model and index.
+    Failures are retried with exponential backoff; once the attempts run out, /healthz fails too.
+    """
+    global search_service, startup_error, _reranker_warmup
+    for attempt in range(settings.STARTUP_ATTEMPTS):
+        service = None
+        try:
+            service = await executor.run_blocking(_build_service)
+
+            # One real embedding and index query so the first user request doesn't pay for
+            # kernel initialisation, lazy weight loading or opening the vector and keyword indexes
+            start = time.perf_counter()
+            await service.vector_store.search(settings.WARMUP_QUERY, limit=1)
+            if settings.HYBRID_SEARCH:
+                await executor.run_blocking(service.keyword_index)
+            # Summary prompt tokenizer, which tiktoken may download on first use
+            await executor.run_blocking(count_tokens, settings.WARMUP_QUERY)
+            STARTUP_SECONDS.set(time.perf_counter() - start, phase="warmup")
+
+            search_service = service
+            STARTUP_SECONDS.set(time.perf_counter() - _process_start, phase="ready")
+            print(f"Search service ready after {time.perf_counter() - _process_start:.1f}s")
+            if settings.RERANK_WARMUP:
+                _reranker_warmup = asyncio.create_task(_warm_reranker(service))
+            return
+        except Exception as e:
+            if service is not None:
+                try:
+                    await service.close()
+                except Exception as close_error:
+                    print(f"Closing search service failed: {close_error}")
+            if attempt == settings.STARTUP_ATTEMPTS - 1:
+                startup_error = str(e)
+                print(f"Search service startup failed: {e}")
+                return
+            delay = min(settings.STARTUP_RETRY_MAX_DELAY, settings.STARTUP_RETRY_DELAY * 2 ** attempt)
+            print(f"Search service startup failed ({e}), retrying in {delay:.1f}s")
+            await asyncio.sleep(delay)
+
+async def _warm_reranker(service):
+    """Load the optional cross-encoder after the service is ready; a failure only affects rerank requests."""
+    try:
+        await executor.run_blocking(
+            service.reranker.score, settings.WARMUP_QUERY, [settings.WARMUP_QUERY], float("inf")
+        )
+        print("Reranker warmed")
+    except Exception as e:
+        print(f"Reranker warmup failed: {e}")
+
+def _require_service():
+    if search_service is None:
+        raise HTTPException(status_code=503, detail="Search service is starting up")
+    return search_service
+
+def _record_first_query():
+    global _first_query_done
+    if not _first_query_done:
+        _first_query_done = True
+        STARTUP_SECONDS.set(time.perf_counter() - _process_start, phase="first_query")
 
 @asynccontextmanager
 async def lifespan(app: FastAPI):
-    global search_service
-    search_service = SearchService()
+    loader = asyncio.create_task(_load_service())
+    if not settings.LAZY_STARTUP:
+        await loader
     
     yield
 
+    if not loader.done():
+        loader.cancel()
+    if _reranker_warmup is not None and not _reranker_warmup.done():
+        _reranker_warmup.cancel()
+    if search_service is not None:
+        await search_service.close()
+    executor.shutdown()
+
 app = FastAPI(
     title=settings.PROJECT_NAME,
     lifespan=lifespan
@@ -38,7 +137,55 @@ app.add_middleware(
 
 @app.post("/search", response_model=SearchResponse)
 async def search_transcripts(query: SearchQuery):
-    return await search_service.search(query)
+    response = await _require_service().search(query)
+    _record_first_query()
+    return response
+
+@app.post("/search/batch", response_model=BatchSearchResponse)
+async def batch_search_transcripts(batch: BatchSearchQuery):
+    """Several queries in one request; set summarize=false on queries that only need results. A query
+    that fails gets {"error": ...} in its place instead of failing the batch."""
+    if len(batch.queries) > settings.BATCH_MAX_QUERIES:
+        raise HTTPException(status_code=400, detail=f"At most {settings.BATCH_MAX_QUERIES} queries per batch")
+    response = await _require_service().search_batch(batch.queries)
+    _record_first_query()
+    return response
+
+@app.post("/search/stream")
+async def stream_search_transcripts(query: SearchQuery):
+    """Server-sent events: `results`, then `summary` tokens, then `done` with timings."""
+    service = _require_service()
+
+    async def event_stream():
+        async for event, data in service.search_stream(query):
+            if event == "results":
+                _record_first_query()
+            yield f"event: {event}\ndata: {json.dumps(data)}\n\n"
+
+    return StreamingResponse(
+        event_stream(),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"}
+    )
+
+@app.get("/healthz")
+async def healthz():
+    """Liveness: serving HTTP while models load; fails once startup has given up, so the process is restarted."""
+    if startup_error:
+        return JSONResponse(status_code=503, content={"status": "failed", "error": startup_error})
+    return {"status": "ok"}
+
+@app.get("/readyz")
+async def readyz():
+    """Readiness: models loaded and warmed; route search traffic only once this returns 200."""
+    if search_service is not None:
+        return {"status": "ready"}
+    status = "failed" if startup_error else "loading"
+    return JSONResponse(status_code=503, content={"status": status, "error": startup_error})
+
+@app.get("/metrics", response_class=PlainTextResponse)
+async def get_metrics():
+    return metrics.render_latest()
 
 if __name__ == "__main__":
     import uvicorn
@@ -0,0 +1,81 @@
+"""
+Minimal Prometheus-style metrics registry, rendered in the text exposition format at /metrics.
+"""
+
+from collections import defaultdict
+
+_registry = []
+
+def _format_labels(labels: tuple) -> str:
+    if not labels:
+        return ""
+    return "{" + ",".join(f'{name}="{value}"' for name, value in labels) + "}"
+
+class Counter:
+    def __init__(self, name: str, description: str):
+        self.name = name
+        self.description = description
+        self._values = defaultdict(float)
+        _registry.append(self)
+
+    def inc(self, amount: float = 1, **labels):
+        self._values[tuple(sorted(labels.items()))] += amount
+
+    def value(self, **labels) -> float:
+        return self._values.get(tuple(sorted(labels.items())), 0.0)
+
+    def render(self) -> list[str]:
+        lines = [f"# HELP {self.name} {self.description}", f"# TYPE {self.name} counter"]
+        for labels, value in self._values.items():
+            lines.append(f"{self.name}{_format_labels(labels)} {value}")
+        return lines
+
+class Gauge(Counter):
+    def set(self, value: float, **labels):
+        self._values[tuple(sorted(labels.items()))] = value
+
+    def render(self) -> list[str]:
+        lines = super().render()
+        lines[1] = f"# TYPE {self.name} gauge"
+        return lines
+
+class Histogram:
+    def __init__(self, name: str, description: str, buckets: tuple):
+        self.name = name
+        self.description = description
+        self.buckets = tuple(sorted(buckets))
+        self._counts = defaultdict(lambda: [0] * (len(self.buckets) + 1))
+        self._sums = defaultdict(float)
+        _registry.append(self)
+
+    def observe(self, value: float, **labels):
+        key = tuple(sorted(labels.items()))
+        counts = self._counts[key]
+        for i, bound in enumerate(self.buckets):
+            if value <= bound:
+                counts[i] += 1
+                break
+        else:
+            counts[-1] += 1
+        self._sums[key] += value
+
+    def count(self, **labels) -> int:
+        return sum(self._counts.get(tuple(sorted(labels.items())), ()))
+
+    def render(self) -> list[str]:
+        lines = [f"# HELP {self.name} {self.description}", f"# TYPE {self.name} histogram"]
+        for labels, counts in self._counts.items():
+            cumulative = 0
+            for bound, count in zip(self.buckets + (float("inf"),), counts):
+                cumulative += count
+                le = "+Inf" if bound == float("inf") else bound
+                lines.append(f"{self.name}_bucket{_format_labels(labels + (('le', le),))} {cumulative}")
+            lines.append(f"{self.name}_sum{_format_labels(labels)} {self._sums[labels]}")
+            lines.append(f"{self.name}_count{_format_labels(labels)} {cumulative}")
+        return lines
+
+def render_latest() -> str:
+    lines = []
+    for metric in _registry:
+        lines.extend(metric.render())
+    return "\n".join(lines) + "\n"
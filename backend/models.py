@@ -2,22 +2,44 @@
 Pydantic models for the backend.
 """
 
-from pydantic import BaseModel
-from typing import List, Optional
+from pydantic import BaseModel, Field, field_validator
+from typing import List, Optional, Union
 from datetime import datetime
 
+from config import search_namespaces
+
 class SearchQuery(BaseModel):
     query: str
     start_date: Optional[datetime] = None
     end_date: Optional[datetime] = None
     limit: Optional[int] = 10
+    speaker: Optional[str] = None
+    meeting_body: Optional[str] = None
+    # Used in index file paths, so restricted to the namespaces ingestion writes
+    namespace: Optional[str] = Field(None, pattern=r"^[\w-]+$")
+    rerank: bool = False
+    debug: bool = False  # include a per-stage timing breakdown in the response
+    summarize: bool = True
+    # Result diversification: 0 is plain similarity order, higher values trade relevance for
+    # variety (MMR, up to 1); per_meeting_cap limits results from any one meeting
+    diversity: float = Field(0.0, ge=0, le=1)
+    per_meeting_cap: Optional[int] = Field(None, ge=1)
+
+    @field_validator("namespace")
+    @classmethod
+    def known_namespace(cls, namespace: Optional[str]) -> Optional[str]:
+        if namespace is not None and namespace not in search_namespaces():
+            raise ValueError(f"unknown namespace {namespace!r}")
+        return namespace
 
 class SearchResult(BaseModel):
+    chunk_id: str
     event_id: str
     text: str
     meeting_date: datetime
     meeting_title: str
-    speaker: str
+    speaker: str  # first speaker in the chunk
+    speakers: List[str] = []
     relevance_score: float
     start_time: str
     end_time: str
@@ -26,4 +48,19 @@ class SearchResponse(BaseModel):
     results: List[SearchResult]
     total_results: int
     processing_time: float
-    summary: str
+    summary: Optional[str]  # None when the query set summarize=False
+    search_path: str = "enhanced"  # "enhanced", "merged", "raw" or "keyword"
+    rerank_time: Optional[float] = None
+    reranked: Optional[bool] = None  # False when rerank failed or its budget ran out and vector order was kept
+    debug: Optional[dict] = None  # {"total_ms", "spans": [{"stage", "start_ms", "duration_ms", ...}]}
+
+class BatchSearchQuery(BaseModel):
+    queries: List[SearchQuery]
+
+class SearchError(BaseModel):
+    error: str
+
+class BatchSearchResponse(BaseModel):
+    # In the same order as the queries; a query that failed gets a SearchError in its place
+    responses: List[Union[SearchResponse, SearchError]]
+    processing_time: float
@@ -0,0 +1,38 @@
+"""
+Cross-encoder reranking of retrieved chunks on CPU, scored in batches under a time budget.
+"""
+
+import time
+import threading
+from typing import List, Optional
+
+class Reranker:
+    def __init__(self, model_name: str, batch_size: int = 16):
+        self.model_name = model_name
+        self.batch_size = batch_size
+        self._model = None
+        self._load_lock = threading.Lock()
+
+    @property
+    def model(self):
+        if self._model is None:
+            # Concurrent first requests wait for one load instead of each loading the model
+            with self._load_lock:
+                if self._model is None:
+                    # Imported here so torch only loads when reranking is used, not with the ONNX embedding backend
+                    from sentence_transformers import CrossEncoder
+                    self._model = CrossEncoder(self.model_name, device="cpu")
+        return self._model
+
+    def score(self, query: str, texts: List[str], deadline: float) -> Optional[List[float]]:
+        """
+        Relevance score per text, or None if the monotonic deadline passes first.
+        The deadline is checked between batches, so a call overruns by at most one batch.
+        """
+        scores = []
+        for start in range(0, len(texts), self.batch_size):
+            if time.monotonic() > deadline:
+                return None
+            batch = texts[start:start + self.batch_size]
+            scores.extend(self.model.predict([(query, text) for text in batch], batch_size=self.batch_size).tolist())
+        return scores
@@ -4,61 +4,424 @@ Vector search, query enhancement, result processing, and summary generation.
 """
 
 import time
-import redis
-import openai
+import asyncio
+import threading
 from datetime import datetime
+from typing import Optional
 
-from models import SearchQuery, SearchResult, SearchResponse
-from vector_store import VectorStore
 from config import settings
+from models import SearchQuery, SearchResult, SearchResponse, SearchError, BatchSearchResponse
+from vector_store import VectorStore
+from semantic_cache import SemanticCache, normalize_query
+from summary_cache import generation_key, summary_key
+from chunk_metadata import build_filter, matches_filter
+from keyword_index import KeywordIndex, is_keyword_query
+from local_index import Match
+from executor import run_blocking
+from reranker import Reranker
+from metrics import Counter
+from tracing import start_trace, span, record_usage
+from clients import (
+    create_openai_client, create_redis_client, with_retries, CircuitBreaker, OPENAI_RETRYABLE
+)
+from single_flight import SingleFlight, ReplicaLock
+from tiered_cache import TieredCache, TEXT
+from chunk_store import ChunkStore
+from context_window import MeetingContext, build_contexts, meeting_header, segment_line
+from context_packer import pack_contexts
+from diversify import diversify, cap_per_meeting, meeting_key
+
+RERANK_REQUESTS = Counter("rerank_requests_total", "Rerank stage runs by outcome (reranked, budget_exceeded or failed)")
+RERANK_SECONDS = Counter("rerank_seconds_total", "Wall-clock seconds spent in the rerank stage")
+
+# Bump when the summary prompt changes so cached summaries from the old prompt are not reused
+SUMMARY_PROMPT_VERSION = "2"
 
 class SearchService:
-    def __init__(self):
-        self.vector_store = VectorStore()
-        self.redis_client = redis.from_url(settings.REDIS_URL)
-        openai.api_key = settings.OPENAI_API_KEY
+    def __init__(self, vector_store=None, redis_client=None, openai_client=None):
+        self.redis_client = redis_client or create_redis_client()
+        self.vector_store = vector_store or VectorStore(redis_client=self.redis_client)
+        self.enhancement_store = TieredCache(
+            "enhancement", TEXT, self.redis_client,
+            max_entries=settings.LOCAL_CACHE_MAX_ENTRIES, local_ttl=settings.LOCAL_CACHE_TTL, redis_ttl=3600
+        )
+        self.summary_store = TieredCache(
+            "summary", TEXT, self.redis_client,
+            max_entries=settings.LOCAL_CACHE_MAX_ENTRIES, local_ttl=settings.LOCAL_CACHE_TTL, redis_ttl=3600
+        )
+        self.openai_client = openai_client or create_openai_client()
+        self.openai_breaker = CircuitBreaker(
+            "openai",
+            failure_threshold=settings.OPENAI_BREAKER_FAILURES,
+            reset_timeout=settings.OPENAI_BREAKER_RESET
+        )
+        self.enhance_flight = SingleFlight("enhancement")
+        self.summary_flight = SingleFlight("summary")
+        self.replica_lock = ReplicaLock(
+            self.redis_client,
+            ttl_ms=settings.COALESCE_LOCK_TTL_MS,
+            wait_ms=settings.COALESCE_LOCK_WAIT_MS
+        ) if settings.COALESCE_REDIS_LOCK else None
+        self._background_tasks = set()
+        self.keyword_indexes = {}
+        self._keyword_indexes_lock = threading.Lock()
+        self.chunk_store = ChunkStore(settings.CHUNK_STORE_PATH)
+        self.reranker = Reranker(settings.RERANK_MODEL, batch_size=settings.RERANK_BATCH_SIZE)
+        self.enhancement_cache = SemanticCache(
+            "enhancement",
+            max_entries=settings.SEMANTIC_CACHE_MAX_ENTRIES,
+            ttl=settings.SEMANTIC_CACHE_TTL,
+            threshold=settings.SEMANTIC_CACHE_THRESHOLD
+        )
+
+    async def close(self):
+        await self.vector_store.close()
+        await self.redis_client.aclose()
+        await self.openai_client.close()
 
     async def search(self, search_query: SearchQuery) -> SearchResponse:
         start_time = time.time()
+        trace = start_trace()
         
-        # Enhance query with llm generated keywords
-        enhanced_query = await self._enhance_query(search_query.query)
-
-        # Semantic search on vector store
-        results = await self.vector_store.search(
-            enhanced_query,
-            limit=search_query.limit
-        )
-
-        search_results = [
-            SearchResult(
-                event_id=result.metadata["annotation_event_id"],
-                text=result.metadata["text"],
-                meeting_date=result.metadata["session_date"],
-                meeting_title=result.metadata["annotation_meeting_name"],
-                speaker=result.metadata["speaker"],
-                relevance_score=result.score,
-                start_time=result.metadata["start_time"],
-                end_time=result.metadata["end_time"]
-            )
-            for result in results
-        ]
+        search_results, search_path, rerank = await self._retrieve(search_query)
 
         # Generate llm summary
-        summary = await self._generate_summary(search_results, search_query.query)
+        summary = None
+        if search_query.summarize:
+            summary = await self._generate_summary(search_results, search_query.query, search_query.namespace)
         
         return SearchResponse(
             results=search_results,
             total_results=len(search_results),
             processing_time=time.time() - start_time,
-            summary=summary
+            summary=summary,
+            search_path=search_path,
+            debug=trace.breakdown() if search_query.debug else None,
+            **rerank
         )
 
+    async def search_batch(self, queries: list[SearchQuery]) -> BatchSearchResponse:
+        """
+        Run several searches together. Raw and normalised query texts are embedded in one encode
+        call up front; the per-query pipelines then fan out concurrently, so enhancements and
+        index queries overlap and enhanced-query embeddings share micro-batches.
+        """
+        start_time = time.time()
+
+        texts = [q.query for q in queries] + [normalize_query(q.query) for q in queries]
+        try:
+            await self.vector_store.embed_many(list(dict.fromkeys(texts)))
+        except Exception as e:
+            # Only a head start; each search embeds whatever is missing
+            print(f"Batch embedding failed: {e}")
+
+        semaphore = asyncio.Semaphore(settings.BATCH_CONCURRENCY)
+
+        async def run(search_query: SearchQuery):
+            # One failing query must not cost the others their results
+            async with semaphore:
+                try:
+                    return await self.search(search_query)
+                except Exception as e:
+                    print(f"Batch search failed for {search_query.query!r}: {e}")
+                    return SearchError(error=str(e))
+
+        responses = await asyncio.gather(*(run(q) for q in queries))
+        return BatchSearchResponse(responses=list(responses), processing_time=time.time() - start_time)
+
+    async def search_stream(self, search_query: SearchQuery):
+        """
+        Yield (event, data) pairs: the result list as soon as retrieval finishes,
+        then summary tokens as they are generated, then final timings.
+        """
+        start_time = time.time()
+        trace = start_trace()
+
+        search_results, search_path, rerank = await self._retrieve(search_query)
+        retrieval_time = time.time() - start_time
+        yield "results", {
+            "results": [result.model_dump(mode="json") for result in search_results],
+            "total_results": len(search_results),
+            "search_path": search_path,
+            **rerank
+        }
+
+        if search_query.summarize:
+            async for token in self._stream_summary(search_results, search_query.query, search_query.namespace):
+                yield "summary", {"token": token}
+
+        done = {
+            "retrieval_time": retrieval_time,
+            "processing_time": time.time() - start_time
+        }
+        if search_query.debug:
+            done["debug"] = trace.breakdown()
+        yield "done", done
+
+    async def _retrieve(self, search_query: SearchQuery):
+        with span("retrieve") as record:
+            search_results, search_path, rerank = await self._retrieve_matches(search_query)
+            record["path"] = search_path
+            return search_results, search_path, rerank
+
+    async def _retrieve_matches(self, search_query: SearchQuery):
+        search_kwargs = self._search_kwargs(search_query)
+
+        keyword_hits = []
+        if settings.HYBRID_SEARCH:
+            keyword_hits = await run_blocking(
+                self._keyword_search, search_query.query, search_query.namespace, search_kwargs["limit"]
+            )
+
+        if keyword_hits and settings.KEYWORD_SKIP_ENHANCEMENT and is_keyword_query(search_query.query):
+            # Exact identifiers are what BM25 is good at; the LLM round trip adds little
+            results = await self.vector_store.search(search_query.query, **search_kwargs)
+            search_path = "keyword"
+        elif settings.SPECULATIVE_SEARCH:
+            results, search_path = await self._speculative_search(search_query, search_kwargs)
+        else:
+            # Enhance query with llm generated keywords
+            enhanced_query = await self._enhance_query(search_query.query)
+
+            # Semantic search on vector store
+            results = await self.vector_store.search(enhanced_query, **search_kwargs)
+            search_path = "enhanced"
+
+        if keyword_hits:
+            results = await self._fuse(results, keyword_hits, search_kwargs)
+        results = await self._hydrate(results, search_query.namespace)
+
+        if search_query.diversity > 0 or search_query.per_meeting_cap:
+            results = await self._diversify(search_query, results)
+
+        rerank = {}
+        if search_query.rerank:
+            results, rerank = await self._rerank(search_query.query, results)
+        results = results[:search_query.limit]
+
+        search_results = [self._to_result(result) for result in results]
+        return search_results, search_path, rerank
+
+    async def _hydrate(self, matches, namespace: Optional[str]):
+        """
+        Add text and meeting-level fields from the chunk store in one bulk lookup. Fields already
+        on the vector record win, so records indexed with full metadata still work.
+        """
+        if not matches:
+            return matches
+        with span("hydrate", chunks=len(matches)):
+            stored = await run_blocking(
+                self.chunk_store.get_many, namespace or settings.PINECONE_NAMESPACE, [m.id for m in matches]
+            )
+
+        hydrated = []
+        for match in matches:
+            metadata = {**stored.get(match.id, {}), **(match.metadata or {})}
+            if "text" not in metadata:
+                print(f"Chunk {match.id} missing from chunk store, skipping")
+                continue
+            hydrated.append(Match(id=match.id, score=match.score, metadata=metadata, values=getattr(match, "values", None)))
+        return hydrated
+
+    async def _diversify(self, search_query: SearchQuery, matches):
+        """
+        Choose the results (or rerank candidates) from the whole fused candidate list: MMR against
+        the raw query when diversity is set, otherwise fused order, both within per_meeting_cap.
+        """
+        target = search_query.limit * (settings.RERANK_OVERFETCH if search_query.rerank else 1)
+        with span("diversify", candidates=len(matches)) as record:
+            if search_query.diversity > 0:
+                query_vector = await self.vector_store.embed(search_query.query)
+                matches = diversify(
+                    matches, query_vector, target, search_query.diversity, search_query.per_meeting_cap
+                )
+            else:
+                matches = cap_per_meeting(matches, search_query.per_meeting_cap)[:target]
+            record["meetings"] = len({meeting_key(match.metadata) for match in matches})
+        return matches
+
+    @staticmethod
+    def _to_result(match) -> SearchResult:
+        metadata = match.metadata
+        speakers = metadata.get("speakers") or [metadata.get("speaker", "Unknown")]
+        return SearchResult(
+            chunk_id=match.id,
+            event_id=metadata.get("annotation_event_id", ""),
+            text=metadata["text"],
+            meeting_date=metadata["session_date"],
+            meeting_title=metadata.get("annotation_meeting_name", ""),
+            speaker=speakers[0],
+            speakers=speakers,
+            relevance_score=match.score,
+            start_time=str(metadata["start_time"]),
+            end_time=str(metadata["end_time"])
+        )
+
+    async def _rerank(self, query: str, matches):
+        with span("rerank", candidates=len(matches)) as record:
+            matches, rerank = await self._rerank_matches(query, matches)
+            record["reranked"] = rerank["reranked"]
+            return matches, rerank
+
+    async def _rerank_matches(self, query: str, matches):
+        """Rescore over-fetched matches with the cross-encoder; keep vector order if it fails or the budget runs out."""
+        start = time.monotonic()
+        budget = settings.RERANK_BUDGET_MS / 1000
+        outcome = "reranked"
+        try:
+            scores = await asyncio.wait_for(
+                run_blocking(self.reranker.score, query, [m.metadata["text"] for m in matches], start + budget),
+                timeout=budget
+            )
+            if scores is None:
+                outcome = "budget_exceeded"
+        except asyncio.TimeoutError:
+            scores, outcome = None, "budget_exceeded"
+        except Exception as e:
+            # The model may be unavailable (failed download or load); rerank is optional
+            print(f"Rerank failed: {e}")
+            scores, outcome = None, "failed"
+        elapsed = time.monotonic() - start
+
+        RERANK_SECONDS.inc(elapsed)
+        RERANK_REQUESTS.inc(outcome=outcome)
+        if scores is None:
+            return matches, {"rerank_time": elapsed, "reranked": False}
+
+        ranked = sorted(zip(scores, matches), key=lambda pair: pair[0], reverse=True)
+        matches = [Match(id=m.id, score=score, metadata=m.metadata) for score, m in ranked]
+        return matches, {"rerank_time": elapsed, "reranked": True}
+
+    def keyword_index(self, namespace: Optional[str] = None) -> KeywordIndex:
+        """The namespace's keyword index, loaded once; concurrent first requests wait for that load."""
+        namespace = namespace or settings.PINECONE_NAMESPACE
+        if (index := self.keyword_indexes.get(namespace)) is None:
+            with self._keyword_indexes_lock:
+                if (index := self.keyword_indexes.get(namespace)) is None:
+                    index = self.keyword_indexes[namespace] = KeywordIndex(settings.KEYWORD_INDEX_PATH, namespace)
+        return index
+
+    def _keyword_search(self, query: str, namespace: Optional[str], limit: int):
+        index = self.keyword_index(namespace)
+        with span("keyword_search") as record:
+            hits = index.search(query, top_k=limit)
+            record["hits"] = len(hits)
+        return hits
+
+    async def _fuse(self, vector_matches, keyword_hits, search_kwargs: dict):
+        """Reciprocal-rank fusion of vector matches and BM25 hits."""
+        scores = {}
+        for ranking in ([match.id for match in vector_matches], [chunk_id for chunk_id, _ in keyword_hits]):
+            for rank, chunk_id in enumerate(ranking):
+                scores[chunk_id] = scores.get(chunk_id, 0.0) + 1 / (settings.RRF_K + rank + 1)
+
+        # Keyword-only hits need their metadata, and did not pass through the index's filter
+        records = {match.id: match for match in vector_matches}
+        fetched = await self.vector_store.fetch(
+            [chunk_id for chunk_id in scores if chunk_id not in records],
+            namespace=search_kwargs["namespace"]
+        )
+        for chunk_id, record in fetched.items():
+            if matches_filter(record.metadata or {}, search_kwargs["metadata_filter"]):
+                records[chunk_id] = record
+
+        ranked = sorted(records, key=lambda chunk_id: scores[chunk_id], reverse=True)[:search_kwargs["limit"]]
+        return [
+            Match(id=chunk_id, score=scores[chunk_id], metadata=records[chunk_id].metadata,
+                  values=records[chunk_id].values if search_kwargs["include_values"] else None)
+            for chunk_id in ranked
+        ]
+
+    @staticmethod
+    def _search_kwargs(search_query: SearchQuery) -> dict:
+        overfetch = settings.RERANK_OVERFETCH if search_query.rerank else 1
+        limit = search_query.limit * overfetch
+        diversified = search_query.diversity > 0 or bool(search_query.per_meeting_cap)
+        if diversified:
+            # A wider candidate set, with vectors, for MMR and the per-meeting cap to choose from
+            limit = max(min(limit * settings.DIVERSITY_OVERFETCH, settings.DIVERSITY_MAX_CANDIDATES), limit)
+        return {
+            "limit": limit,
+            "namespace": search_query.namespace,
+            "include_values": diversified,
+            "metadata_filter": build_filter(
+                start_date=search_query.start_date,
+                end_date=search_query.end_date,
+                speaker=search_query.speaker,
+                meeting_body=search_query.meeting_body
+            )
+        }
+
+    async def _speculative_search(self, search_query: SearchQuery, search_kwargs: dict):
+        """
+        Search on the raw query while enhancement is in flight. If enhancement lands within
+        the latency budget, search again with it and merge; otherwise return the raw results.
+        """
+        query = search_query.query
+        enhance_task = asyncio.create_task(self._enhance_query(query))
+        raw_task = asyncio.create_task(self.vector_store.search(query, **search_kwargs))
+
+        try:
+            enhanced_query = await asyncio.wait_for(
+                asyncio.shield(enhance_task),
+                timeout=settings.ENHANCEMENT_BUDGET_MS / 1000
+            )
+        except asyncio.TimeoutError:
+            # Let enhancement finish in the background so its result still gets cached
+            self._background_tasks.add(enhance_task)
+            enhance_task.add_done_callback(self._background_tasks.discard)
+            return await raw_task, "raw"
+
+        if enhanced_query == query:
+            return await raw_task, "raw"
+
+        enhanced_results, raw_results = await asyncio.gather(
+            self.vector_store.search(enhanced_query, **search_kwargs),
+            raw_task
+        )
+        return self._merge_matches(enhanced_results, raw_results, limit=search_kwargs["limit"]), "merged"
+
+    @staticmethod
+    def _merge_matches(*match_lists, limit: int):
+        """Union matches by id, keeping each chunk's best score."""
+        best = {}
+        for matches in match_lists:
+            for match in matches:
+                if match.id not in best or match.score > best[match.id].score:
+                    best[match.id] = match
+        return sorted(best.values(), key=lambda m: m.score, reverse=True)[:limit]
+
     async def _enhance_query(self, query: str, city: str = "seattle") -> str:
-        cache_key = f"enhanced_query:{query}"
-        
-        if cached := self.redis_client.get(cache_key):
-            return cached.decode()
+        with span("enhance") as record:
+            key = (normalize_query(query), city)
+            if not settings.COALESCE_REQUESTS:
+                return await self._enhance_query_uncached(query, city, record)
+            if self.enhance_flight.in_flight(key):
+                record["coalesced"] = True
+            return await self.enhance_flight.do(key, lambda: self._enhance_query_uncached(query, city, record))
+
+    async def _enhance_query_uncached(self, query: str, city: str, record: dict) -> str:
+        normalized = normalize_query(query)
+        query_vector = await self.vector_store.embed(normalized)
+        if cached := self.enhancement_cache.get(query_vector):
+            record["cache"] = "semantic_hit"
+            return cached
+
+        cache_key = f"enhanced_query:{normalized}"
+        if enhanced := await self.enhancement_store.get(cache_key):
+            record["cache"] = "exact_hit"
+            self.enhancement_cache.put(query_vector, enhanced)
+            return enhanced
+        record["cache"] = "miss"
+
+        lock_token = None
+        if self.replica_lock:
+            cached, lock_token = await self.replica_lock.wait_or_acquire(cache_key, "enhancement")
+            if cached is not None:
+                record["cache"] = "replica_hit"
+                enhanced = cached.decode()
+                self.enhancement_cache.put(query_vector, enhanced)
+                return enhanced
 
         system_prompt = f"""You are a query enhancement system for semantic search of {city} city council transcripts.
         Your task is to enhance queries by adding relevant context and related terms that would appear in the same
@@ -89,35 +452,111 @@ class SearchService:
         Response: construction permits design review board land use notifications zoning changes neighborhood planning development standards impact fees public comment period SEPA review"""
 
         try:
-            completion = openai.chat.completions.create(
-                model="gpt-4o-mini",
-                messages=[
-                    {"role": "system", "content": f"{system_prompt}"},
-                    {"role": "user", "content": f"{query}"}
-                ]
-            )
+            # Checked after the replica lock so a half-open breaker's trial is only taken by a real call
+            if not self.openai_breaker.allow():
+                record["skipped"] = "circuit_open"
+                return query
+            with span("enhance_llm") as llm_record:
+                completion = await self._chat(
+                    [
+                        {"role": "system", "content": f"{system_prompt}"},
+                        {"role": "user", "content": f"{query}"}
+                    ],
+                    timeout=settings.ENHANCEMENT_TIMEOUT
+                )
+                record_usage(llm_record, getattr(completion, "usage", None))
             enhanced = completion.choices[0].message.content
-            self.redis_client.setex(cache_key, 3600, enhanced)
+            await self.enhancement_store.set(cache_key, enhanced)
+            self.enhancement_cache.put(query_vector, enhanced)
             return enhanced
         except Exception as e:
             print(f"Query enhancement failed: {e}")
             return query
+        finally:
+            if lock_token:
+                await self.replica_lock.release(cache_key, lock_token)
 
-    async def _generate_summary(self, results: list[SearchResult], original_query: str) -> str:
-        """Generate a concise summary of search results."""
-        if not results:
-            return "No relevant results found."
+    async def _chat(self, messages: list[dict], timeout: float):
+        """Non-streaming completion with jittered retries on transient errors, tracked by the breaker."""
+        try:
+            completion = await with_retries(
+                lambda: self.openai_client.chat.completions.create(
+                    model="gpt-4o-mini",
+                    messages=messages,
+                    timeout=timeout
+                ),
+                "openai",
+                attempts=settings.OPENAI_RETRIES,
+                retry_on=OPENAI_RETRYABLE
+            )
+        except Exception:
+            self.openai_breaker.record_failure()
+            raise
+        except BaseException:
+            # Cancelled (the client went away): not OpenAI's fault, but free a half-open trial
+            self.openai_breaker.release_trial()
+            raise
+        self.openai_breaker.record_success()
+        return completion
+
+    async def _summary_contexts(self, results: list[SearchResult], original_query: str,
+                                namespace: Optional[str]) -> list[MeetingContext]:
+        """
+        Meeting-level contexts, with the top hits widened by their neighbours in one chunk store lookup,
+        then packed into the summary token budget.
+        """
+        neighbours = {}
+        if settings.CONTEXT_EXPANSION and settings.CONTEXT_WINDOW > 0:
+            hit_ids = [result.chunk_id for result in results[:settings.CONTEXT_EXPAND_TOP]]
+            with span("expand_context", hits=len(hit_ids)) as record:
+                try:
+                    neighbours = await run_blocking(
+                        self.chunk_store.get_neighbours,
+                        namespace or settings.PINECONE_NAMESPACE,
+                        hit_ids,
+                        settings.CONTEXT_WINDOW
+                    )
+                except Exception as e:
+                    # Summarise the hits alone rather than not at all
+                    print(f"Context expansion failed: {e}")
+                record["chunks"] = len({chunk["chunk_id"] for window in neighbours.values() for chunk in window})
+        contexts = build_contexts(results, neighbours)
+        if settings.CONTEXT_PACKING:
+            contexts = await self._pack_contexts(contexts, original_query)
+        return contexts
 
-        cache_key = f"summary:{original_query}"
-        if cached := self.redis_client.get(cache_key):
-            return cached.decode()
+    async def _pack_contexts(self, contexts: list[MeetingContext], original_query: str) -> list[MeetingContext]:
+        with span("pack_context") as record:
+            texts = [segment.text for meeting in contexts for segment in meeting.segments]
+            try:
+                # The query vector is usually an embedding cache hit from retrieval
+                vectors = await self.vector_store.embed_many([normalize_query(original_query), *texts])
+            except Exception as e:
+                print(f"Context embedding failed: {e}")
+                vectors = None
+            try:
+                contexts, stats = await run_blocking(
+                    pack_contexts,
+                    contexts,
+                    settings.SUMMARY_CONTEXT_TOKENS,
+                    query_vector=vectors[0] if vectors else None,
+                    segment_vectors=vectors[1:] if vectors else None,
+                    mmr_lambda=settings.CONTEXT_MMR_LAMBDA,
+                    duplicate_threshold=settings.CONTEXT_DUPLICATE_THRESHOLD
+                )
+                record.update(stats)
+            except Exception as e:
+                print(f"Context packing failed: {e}")
+            return contexts
 
-        current_date = datetime.now().strftime("%Y-%m-%d")
+    def _summary_messages(self, contexts: list[MeetingContext], original_query: str, current_date: str) -> list[dict]:
         context = f"Current date: {current_date}\n\n"
         
-        for result in results:
-            context += f"Meeting: {result.meeting_title} (Date: {result.meeting_date})\n"
-            context += f"Text: {result.text}\n\n"
+        for meeting in contexts:
+            context += meeting_header(meeting)
+            for segment in meeting.segments:
+                context += segment_line(segment)
+            context += "\n"
 
         system_prompt = """You are a city council transcript summarization system. Create a brief, succinct, informative summary 
         of the search results that captures the key points discussed in the provided transcript segments. 
@@ -131,17 +570,143 @@ class SearchService:
         - Just return the summary text itself, no need for formatting
         - Don't include the current date in the response, just use it to orient your answers temporally"""
 
-        try:
-            completion = openai.chat.completions.create(
-                model="gpt-4o-mini",
-                messages=[
-                    {"role": "system", "content": system_prompt},
-                    {"role": "user", "content": f"Original query: {original_query}\n\nRelevant transcript segments:\n{context}"}
-                ]
+        return [
+            {"role": "system", "content": system_prompt},
+            {"role": "user", "content": f"Original query: {original_query}\n\nRelevant transcript segments:\n{context}"}
+        ]
+
+    async def _summary_cache_key(self, results: list[SearchResult], current_date: str,
+                                 namespace: Optional[str] = None) -> str:
+        namespace = namespace or settings.PINECONE_NAMESPACE
+        generation = int(await self.redis_client.get(generation_key(namespace)) or 0)
+        # Expansion and packing settings change the prompt for the same hits
+        expansion = ":".join(str(value) for value in (
+            settings.CONTEXT_EXPANSION, settings.CONTEXT_WINDOW, settings.CONTEXT_EXPAND_TOP,
+            settings.CONTEXT_PACKING, settings.SUMMARY_CONTEXT_TOKENS,
+            settings.CONTEXT_MMR_LAMBDA, settings.CONTEXT_DUPLICATE_THRESHOLD
+        ))
+        return summary_key(
+            namespace,
+            generation,
+            [result.chunk_id for result in results],
+            f"{SUMMARY_PROMPT_VERSION}:{expansion}",
+            current_date
+        )
+
+    async def _generate_summary(self, results: list[SearchResult], original_query: str,
+                                namespace: Optional[str] = None) -> str:
+        """Generate a concise summary of search results."""
+        if not results:
+            return "No relevant results found."
+
+        with span("summary") as record:
+            current_date = datetime.now().strftime("%Y-%m-%d")
+            cache_key = await self._summary_cache_key(results, current_date, namespace)
+            generate = lambda: self._generate_summary_uncached(
+                results, original_query, namespace, current_date, cache_key, record
             )
+            if not settings.COALESCE_REQUESTS:
+                return await generate()
+            if self.summary_flight.in_flight(cache_key):
+                record["coalesced"] = True
+            return await self.summary_flight.do(cache_key, generate)
+
+    async def _generate_summary_uncached(self, results: list[SearchResult], original_query: str,
+                                         namespace: Optional[str], current_date: str, cache_key: str,
+                                         record: dict) -> str:
+        if cached := await self.summary_store.get(cache_key):
+            record["cache"] = "hit"
+            return cached
+        record["cache"] = "miss"
+
+        lock_token = None
+        if self.replica_lock:
+            cached, lock_token = await self.replica_lock.wait_or_acquire(cache_key, "summary")
+            if cached is not None:
+                record["cache"] = "replica_hit"
+                return cached.decode()
+
+        try:
+            contexts = await self._summary_contexts(results, original_query, namespace)
+            # Checked last so the only thing between a half-open breaker's trial and _chat is the call itself
+            if not self.openai_breaker.allow():
+                record["skipped"] = "circuit_open"
+                return "Summary unavailable right now. Please review the individual results."
+            with span("summary_llm") as llm_record:
+                completion = await self._chat(
+                    self._summary_messages(contexts, original_query, current_date),
+                    timeout=settings.SUMMARY_TIMEOUT
+                )
+                record_usage(llm_record, getattr(completion, "usage", None))
             summary = completion.choices[0].message.content
-            self.redis_client.setex(cache_key, 3600, summary)
+            await self.summary_store.set(cache_key, summary)
             return summary
         except Exception as e:
             print(f"Summary generation failed: {e}")
-            return "Summary generation failed. Please review the individual results."
\ No newline at end of file
+            return "Summary generation failed. Please review the individual results."
+        finally:
+            if lock_token:
+                await self.replica_lock.release(cache_key, lock_token)
+
+    async def _stream_summary(self, results: list[SearchResult], original_query: str,
+                              namespace: Optional[str] = None):
+        """Streaming variant of _generate_summary, yielding text deltas as the LLM produces them."""
+        if not results:
+            yield "No relevant results found."
+            return
+
+        with span("summary") as record:
+            current_date = datetime.now().strftime("%Y-%m-%d")
+            cache_key = await self._summary_cache_key(results, current_date, namespace)
+            if cached := await self.summary_store.get(cache_key):
+                record["cache"] = "hit"
+                yield cached
+                return
+            record["cache"] = "miss"
+            try:
+                contexts = await self._summary_contexts(results, original_query, namespace)
+            except Exception as e:
+                print(f"Summary generation failed: {e}")
+                yield "Summary generation failed. Please review the individual results."
+                return
+            if not self.openai_breaker.allow():
+                record["skipped"] = "circuit_open"
+                yield "Summary unavailable right now. Please review the individual results."
+                return
+
+            parts, succeeded, failed = [], False, False
+            try:
+                start = time.perf_counter()
+                stream = await self.openai_client.chat.completions.create(
+                    model="gpt-4o-mini",
+                    messages=self._summary_messages(contexts, original_query, current_date),
+                    stream=True,
+                    stream_options={"include_usage": True},
+                    timeout=settings.SUMMARY_TIMEOUT
+                )
+                async for chunk in stream:
+                    record_usage(record, getattr(chunk, "usage", None))
+                    if chunk.choices and (delta := chunk.choices[0].delta.content):
+                        if not parts:
+                            record["first_token_ms"] = round((time.perf_counter() - start) * 1000, 2)
+                        parts.append(delta)
+                        yield delta
+                succeeded = True
+            except Exception as e:
+                failed = True
+                print(f"Summary generation failed: {e}")
+            finally:
+                # Settle on every exit. A client disconnecting mid-stream is a normal abort, not an
+                # OpenAI failure, but must still free a half-open breaker's trial call
+                if succeeded:
+                    self.openai_breaker.record_success()
+                elif failed:
+                    self.openai_breaker.record_failure()
+                else:
+                    self.openai_breaker.release_trial()
+
+            if not succeeded:
+                if not parts:
+                    yield "Summary generation failed. Please review the individual results."
+                return
+            await self.summary_store.set(cache_key, "".join(parts))
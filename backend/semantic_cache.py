@@ -0,0 +1,104 @@
+"""
+In-process semantic cache for LLM outputs, keyed by query embedding similarity rather than exact text.
+"""
+
+import re
+import time
+import numpy as np
+from collections import OrderedDict
+from typing import Optional
+
+from metrics import Counter, Gauge
+
+CACHE_LOOKUPS = Counter("semantic_cache_lookups_total", "Semantic cache lookups by cache kind and result")
+CACHE_EVICTIONS = Counter("semantic_cache_evictions_total", "Semantic cache entries evicted by LRU or TTL")
+CACHE_ENTRIES = Gauge("semantic_cache_entries", "Live entries in the semantic cache")
+
+_PUNCTUATION = re.compile(r"[^\w\s]")
+_WHITESPACE = re.compile(r"\s+")
+
+def normalize_query(query: str) -> str:
+    """Lowercase, drop punctuation and collapse whitespace."""
+    query = _PUNCTUATION.sub(" ", query.lower())
+    return _WHITESPACE.sub(" ", query).strip()
+
+class SemanticCache:
+    """
+    Fixed-capacity cache over unit-normalised query vectors. Lookups are a single
+    matrix-vector product over the occupied slots; eviction is LRU with a per-entry TTL.
+    """
+
+    def __init__(self, kind: str, dim: int = 384, max_entries: int = 5000,
+                 ttl: int = 3600, threshold: float = 0.92):
+        self.kind = kind
+        self.ttl = ttl
+        self.threshold = threshold
+        self._vectors = np.zeros((max_entries, dim), dtype=np.float32)
+        self._occupied = np.zeros(max_entries, dtype=bool)
+        self._entries = OrderedDict()  # slot -> (value, expires_at), oldest first
+        self._free = list(range(max_entries - 1, -1, -1))
+        self.hits = 0
+        self.misses = 0
+
+    @staticmethod
+    def _unit(vector) -> np.ndarray:
+        vector = np.asarray(vector, dtype=np.float32)
+        norm = np.linalg.norm(vector)
+        return vector / norm if norm else vector
+
+    def _nearest(self, vector: np.ndarray):
+        if not self._entries:
+            return None, 0.0
+        scores = self._vectors @ vector
+        scores[~self._occupied] = -1.0
+        slot = int(np.argmax(scores))
+        return slot, float(scores[slot])
+
+    def _release(self, slot: int):
+        del self._entries[slot]
+        self._occupied[slot] = False
+        self._free.append(slot)
+        CACHE_EVICTIONS.inc(kind=self.kind)
+
+    def get(self, vector) -> Optional[str]:
+        vector = self._unit(vector)
+        slot, score = self._nearest(vector)
+
+        if slot is not None and score >= self.threshold:
+            value, expires_at = self._entries[slot]
+            if expires_at > time.monotonic():
+                self._entries.move_to_end(slot)
+                self.hits += 1
+                CACHE_LOOKUPS.inc(kind=self.kind, result="hit")
+                return value
+            self._release(slot)
+            CACHE_ENTRIES.set(len(self._entries), kind=self.kind)
+
+        self.misses += 1
+        CACHE_LOOKUPS.inc(kind=self.kind, result="miss")
+        return None
+
+    def put(self, vector, value: str):
+        vector = self._unit(vector)
+        slot, score = self._nearest(vector)
+
+        # Overwrite a near-identical entry instead of storing a duplicate
+        if slot is None or score < self.threshold:
+            if not self._free:
+                self._release(next(iter(self._entries)))
+            slot = self._free.pop()
+
+        self._vectors[slot] = vector
+        self._occupied[slot] = True
+        self._entries[slot] = (value, time.monotonic() + self.ttl)
+        self._entries.move_to_end(slot)
+        CACHE_ENTRIES.set(len(self._entries), kind=self.kind)
+
+    def stats(self) -> dict:
+        lookups = self.hits + self.misses
+        return {
+            "entries": len(self._entries),
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": self.hits / lookups if lookups else 0.0
+        }
@@ -0,0 +1,80 @@
+"""
+Request coalescing. SingleFlight shares one in-flight call between concurrent identical requests in
+this process; ReplicaLock does the same across replicas with a Redis SET NX lock next to the cache key.
+"""
+
+import uuid
+import asyncio
+from typing import Optional, Tuple
+
+from metrics import Counter
+
+COALESCED = Counter("coalesced_calls_total", "Calls served by another caller's in-flight work, by kind and scope")
+
+class SingleFlight:
+    def __init__(self, kind: str):
+        self.kind = kind
+        self._in_flight = {}
+
+    def in_flight(self, key) -> bool:
+        return key in self._in_flight
+
+    async def do(self, key, call):
+        """
+        Await call() unless an identical call is already running, in which case await that one.
+        The shared task is shielded so one caller disconnecting doesn't cancel it for the others.
+        """
+        if (task := self._in_flight.get(key)) is not None:
+            COALESCED.inc(kind=self.kind, scope="process")
+            return await asyncio.shield(task)
+
+        task = asyncio.ensure_future(call())
+        self._in_flight[key] = task
+        task.add_done_callback(lambda _: self._in_flight.pop(key, None))
+        return await asyncio.shield(task)
+
+# Delete the lock only if it still holds our token; after the TTL another replica may own it
+_RELEASE_SCRIPT = """
+if redis.call("get", KEYS[1]) == ARGV[1] then
+    return redis.call("del", KEYS[1])
+end
+return 0
+"""
+
+class ReplicaLock:
+    """
+    Before computing a cache miss, take `lock:<cache_key>`. Replicas that find it held poll the
+    cache key for the holder's result instead of repeating the work, up to wait_ms, and then
+    compute it themselves so a crashed holder only costs one wait.
+    """
+
+    def __init__(self, redis_client, ttl_ms: int, wait_ms: int, poll_ms: int = 50):
+        self.redis_client = redis_client
+        self.ttl_ms = ttl_ms
+        self.wait = wait_ms / 1000
+        self.poll = poll_ms / 1000
+
+    async def wait_or_acquire(self, cache_key: str, kind: str) -> Tuple[Optional[bytes], Optional[str]]:
+        """
+        Return (value another replica wrote, None), or (None, lock token) if this caller took the
+        lock, or (None, None) if the wait ran out.
+        """
+        lock_key = f"lock:{cache_key}"
+        token = uuid.uuid4().hex
+        if await self.redis_client.set(lock_key, token, nx=True, px=self.ttl_ms):
+            return None, token
+
+        loop = asyncio.get_running_loop()
+        deadline = loop.time() + self.wait
+        while loop.time() < deadline:
+            await asyncio.sleep(self.poll)
+            if (value := await self.redis_client.get(cache_key)) is not None:
+                COALESCED.inc(kind=kind, scope="replica")
+                return value, None
+        return None, None
+
+    async def release(self, cache_key: str, token: str):
+        try:
+            await self.redis_client.eval(_RELEASE_SCRIPT, 1, f"lock:{cache_key}", token)
+        except Exception as e:
+            print(f"Releasing coalescing lock failed: {e}")
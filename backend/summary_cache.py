@@ -0,0 +1,22 @@
+"""
+Content-addressed summary cache keys and the invalidation hook ingestion calls after upserts.
+"""
+
+import hashlib
+from typing import Iterable
+
+def generation_key(namespace: str) -> str:
+    return f"summary_generation:{namespace}"
+
+def summary_key(namespace: str, generation: int, chunk_ids: Iterable[str],
+                prompt_version: str, current_date: str) -> str:
+    """Key a summary on the ordered result set, prompt version and the date baked into the prompt."""
+    digest = hashlib.sha256()
+    for part in (prompt_version, current_date, *chunk_ids):
+        digest.update(part.encode())
+        digest.update(b"\0")
+    return f"summary:{namespace}:{generation}:{digest.hexdigest()}"
+
+def invalidate_namespace(redis_client, namespace: str):
+    """Bump the namespace generation so summaries over previously indexed chunks are no longer served."""
+    return redis_client.incr(generation_key(namespace))
@@ -0,0 +1,133 @@
+"""
+Two-tier cache: a bounded in-process LRU with TTL in front of Redis, which stores compact bytes.
+"""
+
+import time
+import asyncio
+import msgpack
+import numpy as np
+import redis
+from collections import OrderedDict
+from typing import Any, Callable, List, Optional
+
+from local_index import Match
+from metrics import Counter, Gauge
+from tracing import span
+
+CACHE_REQUESTS = Counter("tiered_cache_requests_total", "Tiered cache lookups by kind, tier and result")
+CACHE_EVICTIONS = Counter("tiered_cache_evictions_total", "Local tier entries evicted by LRU or TTL, by kind")
+CACHE_ENTRIES = Gauge("tiered_cache_entries", "Live entries in the local tier, by kind")
+CACHE_HIT_RATIO = Gauge("tiered_cache_hit_ratio", "Hit ratio since startup, by kind and tier")
+
+class Codec:
+    def __init__(self, encode: Callable[[Any], bytes], decode: Callable[[bytes], Any]):
+        self.encode = encode
+        self.decode = decode
+
+# UTF-8, so existing enhancement and summary keys stay readable
+TEXT = Codec(lambda value: value.encode(), lambda data: data.decode())
+
+EMBEDDING = Codec(
+    lambda vector: np.asarray(vector, dtype=np.float16).tobytes(),
+    lambda data: np.frombuffer(data, dtype=np.float16).astype(np.float32).tolist()
+)
+
+def _encode_matches(matches: List) -> bytes:
+    # Candidate vectors, when the query asked for them, are kept as float16 bytes
+    return msgpack.packb([
+        [m.id, float(m.score), m.metadata,
+         None if not getattr(m, "values", None) else np.asarray(m.values, dtype=np.float16).tobytes()]
+        for m in matches
+    ])
+
+def _decode_matches(data: bytes) -> List[Match]:
+    matches = []
+    for id, score, metadata, *values in msgpack.unpackb(data):
+        # Entries written before vectors were cached have no fourth field
+        values = values[0] if values else None
+        if values is not None:
+            values = np.frombuffer(values, dtype=np.float16).astype(np.float32).tolist()
+        matches.append(Match(id=id, score=score, metadata=metadata, values=values))
+    return matches
+
+MATCHES = Codec(_encode_matches, _decode_matches)
+
+class TieredCache:
+    def __init__(self, kind: str, codec: Codec, redis_client=None, max_entries: int = 2000,
+                 local_ttl: int = 300, redis_ttl: int = 3600):
+        self.kind = kind
+        self.codec = codec
+        self.redis_client = redis_client
+        self.max_entries = max_entries
+        self.local_ttl = local_ttl
+        self.redis_ttl = redis_ttl
+        self._entries = OrderedDict()  # key -> (value, expires_at), oldest first
+        self._counts = {"local": [0, 0], "redis": [0, 0]}  # tier -> [hits, misses]
+
+    def _record(self, tier: str, hit: bool):
+        counts = self._counts[tier]
+        counts[0 if hit else 1] += 1
+        CACHE_REQUESTS.inc(kind=self.kind, tier=tier, result="hit" if hit else "miss")
+        CACHE_HIT_RATIO.set(counts[0] / (counts[0] + counts[1]), kind=self.kind, tier=tier)
+
+    def _get_local(self, key: str):
+        if (entry := self._entries.get(key)) is None:
+            return None
+        value, expires_at = entry
+        if expires_at < time.monotonic():
+            del self._entries[key]
+            CACHE_EVICTIONS.inc(kind=self.kind)
+            CACHE_ENTRIES.set(len(self._entries), kind=self.kind)
+            return None
+        self._entries.move_to_end(key)
+        return value
+
+    def _put_local(self, key: str, value):
+        self._entries[key] = (value, time.monotonic() + self.local_ttl)
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+            CACHE_EVICTIONS.inc(kind=self.kind)
+        CACHE_ENTRIES.set(len(self._entries), kind=self.kind)
+
+    async def get(self, key: str) -> Optional[Any]:
+        if (value := self._get_local(key)) is not None:
+            self._record("local", True)
+            return value
+        self._record("local", False)
+
+        if self.redis_client is None:
+            return None
+        # Redis is only a cache: while it is down or slow, callers fall back to computing the value
+        with span("cache", kind=self.kind, op="get") as record:
+            try:
+                data = await self.redis_client.get(key)
+                record["cache"] = "hit" if data is not None else "miss"
+            except (redis.RedisError, asyncio.TimeoutError) as e:
+                print(f"{self.kind} cache read failed: {e}")
+                data = None
+                record["error"] = type(e).__name__
+        self._record("redis", data is not None)
+        if data is None:
+            return None
+        value = self.codec.decode(data)
+        self._put_local(key, value)
+        return value
+
+    async def set(self, key: str, value):
+        self._put_local(key, value)
+        if self.redis_client is None:
+            return
+        with span("cache", kind=self.kind, op="set") as record:
+            try:
+                await self.redis_client.setex(key, self.redis_ttl, self.codec.encode(value))
+            except (redis.RedisError, asyncio.TimeoutError) as e:
+                print(f"{self.kind} cache write failed: {e}")
+                record["error"] = type(e).__name__
+
+    def stats(self) -> dict:
+        stats = {"entries": len(self._entries)}
+        for tier, (hits, misses) in self._counts.items():
+            lookups = hits + misses
+            stats[tier] = {"hits": hits, "misses": misses, "hit_rate": hits / lookups if lookups else 0.0}
+        return stats
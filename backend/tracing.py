@@ -0,0 +1,61 @@
+"""
+Per-request stage spans for the search pipeline, also fed to the search_stage_seconds histogram.
+"""
+
+import time
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Optional
+
+from metrics import Histogram
+
+STAGE_SECONDS = Histogram(
+    "search_stage_seconds", "Latency of each search pipeline stage",
+    buckets=(0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10)
+)
+
+# Spans opened anywhere below SearchService.search, including in tasks it spawns, attach to this trace
+_current_trace: ContextVar[Optional["Trace"]] = ContextVar("current_trace", default=None)
+
+class Trace:
+    def __init__(self):
+        self.start = time.perf_counter()
+        self.spans = []
+
+    def breakdown(self) -> dict:
+        return {
+            "total_ms": round((time.perf_counter() - self.start) * 1000, 2),
+            "spans": sorted(self.spans, key=lambda s: s["start_ms"])
+        }
+
+def start_trace() -> Trace:
+    trace = Trace()
+    _current_trace.set(trace)
+    return trace
+
+@contextmanager
+def span(stage: str, **attributes):
+    """
+    Time a stage. The yielded dict can be annotated while the stage runs, e.g. with
+    cache="hit" or token counts, and ends up in the request's debug breakdown.
+    """
+    record = dict(attributes)
+    start = time.perf_counter()
+    try:
+        yield record
+    finally:
+        end = time.perf_counter()
+        STAGE_SECONDS.observe(end - start, stage=stage)
+        if (trace := _current_trace.get()) is not None:
+            trace.spans.append({
+                "stage": stage,
+                "start_ms": round((start - trace.start) * 1000, 2),
+                "duration_ms": round((end - start) * 1000, 2),
+                **record
+            })
+
+def record_usage(record: dict, usage):
+    """Copy OpenAI token counts onto a span, when the response reports them."""
+    if usage is not None:
+        record["prompt_tokens"] = usage.prompt_tokens
+        record["completion_tokens"] = usage.completion_tokens
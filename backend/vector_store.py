@@ -1,33 +1,174 @@
 """
 Vector database interface for semantic search functionality.
+Backed by Pinecone or by the local file-backed index, selected with VECTOR_BACKEND.
 """
 
-import pinecone
-from typing import List
-from sentence_transformers import SentenceTransformer
+import json
+import hashlib
+import numpy as np
+from typing import List, Optional
 
 from config import settings
+from executor import run_blocking, run_vector_query
+from local_index import LocalIndex
+from embedding_batcher import EmbeddingBatcher
+from embedding_model import load_embedding_model
+from tracing import span
+from clients import create_pinecone_index, with_retries, hedged
+from single_flight import SingleFlight
+from tiered_cache import TieredCache, EMBEDDING, MATCHES
 
-class VectorStore:
-    def __init__(self):
-        _pc = pinecone.Pinecone(api_key=settings.PINECONE_API_KEY)
-        self.index = _pc.Index("council-transcripts")
-        self.model = SentenceTransformer('all-MiniLM-L6-v2')
+def open_index():
+    """Return an index handle exposing the Pinecone Index query/upsert/fetch API."""
+    if settings.VECTOR_BACKEND == "local":
+        return LocalIndex(
+            settings.LOCAL_INDEX_PATH,
+            dtype=settings.LOCAL_INDEX_DTYPE,
+            search=settings.LOCAL_INDEX_SEARCH,
+            nprobe=settings.LOCAL_INDEX_NPROBE
+        )
+    if settings.VECTOR_BACKEND != "pinecone":
+        raise ValueError(f"Unknown VECTOR_BACKEND: {settings.VECTOR_BACKEND}")
+    return create_pinecone_index()
 
+class VectorStore:
+    def __init__(self, index=None, model=None, redis_client=None):
+        self.index = index or open_index()
+        self.model = model or load_embedding_model(settings.EMBEDDING_BACKEND, settings.ONNX_MODEL_PATH)
+        self.batcher = EmbeddingBatcher(
+            self.model,
+            max_batch=settings.EMBED_MAX_BATCH,
+            max_wait_ms=settings.EMBED_MAX_WAIT_MS
+        ) if settings.EMBED_BATCHING else None
+        self.embed_flight = SingleFlight("embedding")
+        self.search_flight = SingleFlight("vector_search")
+        self.embedding_store = TieredCache(
+            "embedding", EMBEDDING, redis_client,
+            max_entries=settings.LOCAL_CACHE_MAX_ENTRIES,
+            local_ttl=settings.LOCAL_CACHE_TTL,
+            redis_ttl=settings.EMBEDDING_CACHE_TTL
+        )
+        self.results_store = TieredCache(
+            "vector_results", MATCHES, redis_client,
+            max_entries=settings.LOCAL_CACHE_MAX_ENTRIES,
+            local_ttl=min(settings.LOCAL_CACHE_TTL, settings.SEARCH_CACHE_TTL),
+            redis_ttl=settings.SEARCH_CACHE_TTL
+        )
 
     def _text_to_vector(self, text: str) -> List[float]:
         embedding = self.model.encode(text)
         return embedding.tolist()
+
+    async def embed(self, text: str) -> List[float]:
+        if settings.COALESCE_REQUESTS:
+            return await self.embed_flight.do(text, lambda: self._embed(text))
+        return await self._embed(text)
+
+    @staticmethod
+    def _embedding_key(text: str) -> str:
+        return f"embedding:{settings.EMBEDDING_BACKEND}:{hashlib.sha256(text.encode()).hexdigest()}"
+
+    async def _embed(self, text: str) -> List[float]:
+        with span("embed") as record:
+            cache_key = self._embedding_key(text)
+            if (vector := await self.embedding_store.get(cache_key)) is not None:
+                record["cache"] = "hit"
+                return vector
+            record["cache"] = "miss"
+
+            if self.batcher:
+                vector = await self.batcher.embed(text)
+            else:
+                vector = await run_blocking(self._text_to_vector, text)
+            await self.embedding_store.set(cache_key, vector)
+            return vector
+
+    async def embed_many(self, texts: List[str]) -> List[List[float]]:
+        """
+        Embed texts with a single encode call for the cache misses. Results go into the embedding
+        cache, so later embed() calls for the same texts are local hits.
+        """
+        keys = [self._embedding_key(text) for text in texts]
+        vectors = {}
+        for text, key in zip(texts, keys):
+            if (vector := await self.embedding_store.get(key)) is not None:
+                vectors[text] = vector
+
+        missing = sorted({text for text in texts if text not in vectors})
+        if missing:
+            with span("embed_batch", texts=len(missing)):
+                encoded = await run_blocking(self.model.encode, missing, batch_size=len(missing))
+            for text, vector in zip(missing, encoded.tolist()):
+                vectors[text] = vector
+                await self.embedding_store.set(self._embedding_key(text), vector)
+        return [vectors[text] for text in texts]
+
+    async def close(self):
+        if self.batcher:
+            await self.batcher.close()
     
-    async def search(self, query: str, limit: int = 10):
-        query_vector = self._text_to_vector(query)
-        
-        results = self.index.query(
-            namespace="seattle",
-            vector=query_vector,
-            top_k=limit,
-            include_metadata=True
-        )
+    async def search(self, query: str, limit: int = 10, metadata_filter: Optional[dict] = None,
+                     namespace: Optional[str] = None, include_values: bool = False):
+        search = lambda: self._search(query, limit, metadata_filter, namespace, include_values)
+        if not settings.COALESCE_REQUESTS:
+            return await search()
+        key = (query, limit, namespace, json.dumps(metadata_filter, sort_keys=True, default=str), include_values)
+        return await self.search_flight.do(key, search)
+
+    async def _search(self, query: str, limit: int, metadata_filter: Optional[dict], namespace: Optional[str],
+                      include_values: bool):
+        query_vector = await self.embed(query)
+
+        # Keyed on the (float16) query vector, so paraphrases with identical embeddings share an entry
+        digest = hashlib.sha256(np.asarray(query_vector, dtype=np.float16).tobytes())
+        digest.update(json.dumps(
+            [namespace, limit, metadata_filter, include_values], sort_keys=True, default=str
+        ).encode())
+        cache_key = f"vector_results:{digest.hexdigest()}"
+        with span("vector_cache") as record:
+            matches = await self.results_store.get(cache_key)
+            record["cache"] = "hit" if matches is not None else "miss"
+        if matches is not None:
+            return matches
         
+        # Filters are applied by the index so out-of-range chunks never take up top_k slots. Cancelling
+        # a hedged call doesn't stop its thread, so the HTTP request carries the same timeout
+        def query():
+            return run_vector_query(
+                self.index.query,
+                namespace=namespace or settings.PINECONE_NAMESPACE,
+                vector=query_vector,
+                top_k=limit,
+                filter=metadata_filter,
+                include_metadata=True,
+                include_values=include_values,
+                _request_timeout=settings.VECTOR_QUERY_TIMEOUT
+            )
+
+        # A slow primary gets a hedge; a failed or timed-out pair is retried with jitter
+        with span("vector_query", top_k=limit) as record:
+            results = await with_retries(
+                lambda: hedged(
+                    query, "vector_query",
+                    hedge_after=settings.VECTOR_HEDGE_MS / 1000,
+                    timeout=settings.VECTOR_QUERY_TIMEOUT
+                ),
+                "vector_query",
+                attempts=settings.VECTOR_RETRIES
+            )
+            record["matches"] = len(results.matches)
+
+        await self.results_store.set(cache_key, results.matches)
         return results.matches
-        
\ No newline at end of file
+
+    async def fetch(self, ids: List[str], namespace: Optional[str] = None) -> dict:
+        """Fetch records by id; returns id -> record with .id, .values and .metadata."""
+        if not ids:
+            return {}
+        with span("vector_fetch", ids=len(ids)):
+            response = await run_blocking(
+                self.index.fetch,
+                ids=ids,
+                namespace=namespace or settings.PINECONE_NAMESPACE
+            )
+        return response.vectors
@@ -0,0 +1,272 @@
+"""
+Pluggable transcript chunkers, each a streaming generator over transcript.sentences.
+"""
+
+import os
+from types import SimpleNamespace
+from typing import Dict, Iterator, List, Optional
+
+from chunk_metadata import epoch_day
+
+# all-MiniLM-L6-v2 truncates input past 256 word pieces, including [CLS] and [SEP]
+MODEL_MAX_TOKENS = 256
+TOKENIZER_NAME = 'sentence-transformers/all-MiniLM-L6-v2'
+
+class TranscriptChunk:
+    def __init__(self, id: str, text: str, metadata: Dict, transcript_id: Optional[str] = None,
+                 position: Optional[int] = None):
+        self.id = id
+        self.text = text
+        self.metadata = metadata
+        self.transcript_id = transcript_id
+        # Order within the meeting; chunks at position ± 1 are its neighbours
+        self.position = position
+
+def speaker_label(sentence) -> str:
+    if sentence.speaker_name:
+        return sentence.speaker_name
+    if sentence.speaker_index is not None:
+        return f"Speaker {sentence.speaker_index}"
+    return "Unknown"
+
+def transcript_fields(transcript) -> Dict:
+    """Meeting-level fields shared by every chunk, kept once per transcript in the chunk store"""
+    fields = {}
+    if hasattr(transcript, 'annotations'):
+        for key, value in transcript.annotations.__dict__.items():
+            if value is not None:
+                fields[f"annotation_{key}"] = str(value)
+    if session_datetime := transcript.session_datetime:
+        # CDP stores an ISO string; accept datetimes from other sources too
+        fields['session_date'] = session_datetime.isoformat() if hasattr(session_datetime, 'isoformat') else session_datetime
+    fields['generator'] = transcript.generator
+    return fields
+
+def filter_fields(transcript) -> Dict:
+    """Transcript-level fields search filters and diversifies on, so they stay on every vector record"""
+    fields = {}
+    # Numeric day so date ranges can be filtered server-side
+    if transcript.session_datetime:
+        fields['session_day'] = epoch_day(transcript.session_datetime)
+    annotations = getattr(transcript, 'annotations', None)
+    for key in ('meeting_name', 'event_id'):
+        value = getattr(annotations, key, None)
+        if value is not None:
+            fields[f'annotation_{key}'] = str(value)
+    return fields
+
+def make_chunk(transcript_id: str, offset: int, sentences: list, base_metadata: Dict) -> TranscriptChunk:
+    """A chunk's metadata covers exactly its own sentences: first start to last end, every speaker in order"""
+    return TranscriptChunk(
+        id=f"{transcript_id}_{offset}",
+        text=' '.join(sentence.text for sentence in sentences),
+        metadata={
+            **base_metadata,
+            'start_time': float(sentences[0].start_time),
+            'end_time': float(sentences[-1].end_time),
+            'speakers': list(dict.fromkeys(speaker_label(sentence) for sentence in sentences))
+        },
+        transcript_id=transcript_id,
+        position=offset
+    )
+
+class TokenCounter:
+    """Counts MiniLM word pieces. Loads tokenizer.json from a local path, or by name from the Hugging Face hub."""
+
+    def __init__(self, name_or_path: str = TOKENIZER_NAME):
+        self.name_or_path = name_or_path
+        self._tokenizer = None
+
+    # Chunkers are pickled into the embedding worker processes; each loads the tokenizer on first use
+    def __getstate__(self):
+        return {'name_or_path': self.name_or_path, '_tokenizer': None}
+
+    @property
+    def tokenizer(self):
+        if self._tokenizer is None:
+            from tokenizers import Tokenizer
+            if os.path.isdir(self.name_or_path):
+                self._tokenizer = Tokenizer.from_file(os.path.join(self.name_or_path, 'tokenizer.json'))
+            elif os.path.isfile(self.name_or_path):
+                self._tokenizer = Tokenizer.from_file(self.name_or_path)
+            else:
+                self._tokenizer = Tokenizer.from_pretrained(self.name_or_path)
+            self._tokenizer.no_truncation()
+        return self._tokenizer
+
+    def count(self, text: str) -> int:
+        return len(self.tokenizer.encode(text, add_special_tokens=False).ids)
+
+    def split(self, sentence, max_tokens: int) -> list:
+        """Split one over-long sentence into word-aligned pieces of at most max_tokens, keeping its timing and speaker"""
+        pieces, words, length = [], [], 0
+        for word in sentence.text.split():
+            word_tokens = self.count(word)
+            if words and length + word_tokens > max_tokens:
+                pieces.append(words)
+                words, length = [], 0
+            words.append(word)
+            length += word_tokens
+        if words:
+            pieces.append(words)
+        return [SimpleNamespace(**{**vars(sentence), 'text': ' '.join(piece)}) for piece in pieces]
+
+class Chunker:
+    """Base class: subclasses implement _groups, yielding lists of sentences that form one chunk."""
+
+    name = "base"
+
+    @property
+    def signature(self) -> str:
+        """Identifies the chunk layout, so changing any parameter re-indexes through the manifest"""
+        return self.name
+
+    def _groups(self, sentences) -> Iterator[list]:
+        raise NotImplementedError
+
+    def chunks(self, transcript, transcript_id: str) -> Iterator[TranscriptChunk]:
+        base_metadata = filter_fields(transcript)
+        for offset, group in enumerate(self._groups(transcript.sentences)):
+            yield make_chunk(transcript_id, offset, group, base_metadata)
+
+class CharChunker(Chunker):
+    """The original fixed character budget."""
+
+    name = "chars"
+
+    def __init__(self, chunk_size: int = 500):
+        self.chunk_size = chunk_size
+
+    @property
+    def signature(self) -> str:
+        return f"chars-{self.chunk_size}"
+
+    def _groups(self, sentences):
+        current, length = [], 0
+        for sentence in sentences:
+            if length + len(sentence.text) > self.chunk_size and current:
+                yield current
+                current, length = [], 0
+            current.append(sentence)
+            length += len(sentence.text)
+        if current:
+            yield current
+
+class TokenChunker(Chunker):
+    """MiniLM-token budget within the model window, breaking at speaker changes, overlapping within a turn."""
+
+    name = "tokens"
+
+    def __init__(self, max_tokens: int = MODEL_MAX_TOKENS, overlap_tokens: int = 32, min_tokens: int = 48,
+                 break_on_speaker: bool = True, counter: Optional[TokenCounter] = None):
+        # Leave room for [CLS] and [SEP]
+        self.max_tokens = min(max_tokens, MODEL_MAX_TOKENS) - 2
+        self.overlap_tokens = overlap_tokens
+        self.min_tokens = min_tokens
+        self.break_on_speaker = break_on_speaker
+        self.counter = counter or TokenCounter()
+
+    @property
+    def signature(self) -> str:
+        speaker = "speaker" if self.break_on_speaker else "nospeaker"
+        return f"tokens-{self.max_tokens}-{self.overlap_tokens}-{self.min_tokens}-{speaker}"
+
+    def _sized(self, sentences):
+        """(sentence, token count) pairs, splitting any sentence that alone overflows the window"""
+        for sentence in sentences:
+            tokens = self.counter.count(sentence.text)
+            if tokens <= self.max_tokens:
+                yield sentence, tokens
+            else:
+                for piece in self.counter.split(sentence, self.max_tokens):
+                    yield piece, self.counter.count(piece.text)
+
+    def _overlap(self, current: list) -> list:
+        """Trailing sentences of a full chunk, up to overlap_tokens, that open the next one"""
+        carried, total = [], 0
+        for sentence, tokens in reversed(current):
+            if total + tokens > self.overlap_tokens or len(carried) + 1 == len(current):
+                break
+            carried.insert(0, (sentence, tokens))
+            total += tokens
+        return carried
+
+    def _groups(self, sentences):
+        current, length, speaker = [], 0, None
+        for sentence, tokens in self._sized(sentences):
+            label = speaker_label(sentence)
+            # Tiny interjections ("Thank you.") stay with the surrounding turn rather than forming their own chunk
+            if current and self.break_on_speaker and label != speaker and length >= self.min_tokens:
+                yield [s for s, _ in current]
+                current, length = [], 0
+            elif current and length + tokens > self.max_tokens:
+                yield [s for s, _ in current]
+                current = self._overlap(current)
+                length = sum(t for _, t in current)
+                # Overlap only where it still fits alongside the next sentence
+                while current and length + tokens > self.max_tokens:
+                    length -= current.pop(0)[1]
+            current.append((sentence, tokens))
+            length += tokens
+            speaker = label
+        if current:
+            yield [s for s, _ in current]
+
+class TurnChunker(TokenChunker):
+    """One chunk per speaker turn; turns longer than the window are split without overlap."""
+
+    name = "turns"
+
+    def __init__(self, max_tokens: int = MODEL_MAX_TOKENS, counter: Optional[TokenCounter] = None):
+        super().__init__(max_tokens=max_tokens, overlap_tokens=0, min_tokens=0, break_on_speaker=True, counter=counter)
+
+    @property
+    def signature(self) -> str:
+        return f"turns-{self.max_tokens}"
+
+class SentenceWindowChunker(Chunker):
+    """Every sentence with up to `window` neighbours on each side, so each chunk centres on one sentence."""
+
+    name = "sentences"
+
+    def __init__(self, window: int = 1):
+        self.window = window
+
+    @property
+    def signature(self) -> str:
+        return f"sentences-{self.window}"
+
+    def _groups(self, sentences):
+        # Only a 2 * window + 1 sliding buffer is held, not the whole transcript
+        buffer: List = []
+        centre = 0
+        for sentence in sentences:
+            buffer.append(sentence)
+            if len(buffer) > self.window * 2 + 1:
+                buffer.pop(0)
+                centre -= 1
+            if len(buffer) - 1 - centre >= self.window:
+                yield buffer[max(0, centre - self.window):centre + self.window + 1]
+                centre += 1
+        while centre < len(buffer):
+            yield buffer[max(0, centre - self.window):centre + self.window + 1]
+            centre += 1
+
+CHUNKERS = {
+    "chars": CharChunker,
+    "tokens": TokenChunker,
+    "turns": TurnChunker,
+    "sentences": SentenceWindowChunker,
+}
+
+def create_chunker(name: str, max_tokens: int = MODEL_MAX_TOKENS, overlap_tokens: int = 32,
+                   tokenizer: str = TOKENIZER_NAME) -> Chunker:
+    if name == "chars":
+        return CharChunker()
+    if name == "sentences":
+        return SentenceWindowChunker()
+    if name == "turns":
+        return TurnChunker(max_tokens=max_tokens, counter=TokenCounter(tokenizer))
+    if name == "tokens":
+        return TokenChunker(max_tokens=max_tokens, overlap_tokens=overlap_tokens, counter=TokenCounter(tokenizer))
+    raise ValueError(f"Unknown chunker: {name}")
@@ -1,5 +1,14 @@
 import os
+import sys
+import queue
+import argparse
+import threading
+import multiprocessing
 import time
+import hashlib
+import itertools
+import redis
+import numpy as np
 from dotenv import load_dotenv
 from cdp_backend.database import models as db_models
 from cdp_backend.pipeline.transcript_model import Transcript
@@ -7,25 +16,121 @@ import fireo
 from gcsfs import GCSFileSystem
 from google.auth.credentials import AnonymousCredentials
 from google.cloud.firestore import Client
-from datetime import datetime
-from typing import List, Dict
-from sentence_transformers import SentenceTransformer
+from typing import List, Dict, Optional
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor, ProcessPoolExecutor
 from pinecone import Pinecone, ServerlessSpec
 from tqdm import tqdm
 
-class TranscriptChunk:
-    def __init__(self, text: str, metadata: Dict):
-        self.text = text
-        self.metadata = metadata
+# Share helpers with the backend; the modules imported from there must not import its config or clients
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'backend'))
+from summary_cache import invalidate_namespace
+from chunk_metadata import epoch_day
+from local_index import LocalIndex
+from keyword_index import KeywordIndex
+from embedding_model import MODEL_NAME, load_embedding_model
+from chunk_store import ChunkStore
+from manifest import IngestManifest
+from chunking import TranscriptChunk, Chunker, TokenChunker, CHUNKERS, TOKENIZER_NAME, create_chunker, transcript_fields
+
+# Bump when chunk metadata changes so the manifest re-indexes every transcript; chunk layout
+# changes are caught by the chunker's signature
+CHUNKER_VERSION = '5'
+UPSERT_BATCH_SIZE = 100
+
+# Marks the end of a pipeline stage's output
+_DONE = object()
+
+def embed_texts(model, texts: List[str], batch_size: int) -> np.ndarray:
+    """Embed texts in large batches, longest first so each batch pads to similar lengths"""
+    order = sorted(range(len(texts)), key=lambda i: len(texts[i]), reverse=True)
+    embeddings = np.empty((len(texts), model.get_sentence_embedding_dimension()), dtype=np.float32)
+    for i in range(0, len(order), batch_size):
+        batch = order[i:i + batch_size]
+        embeddings[batch] = model.encode(
+            [texts[j] for j in batch],
+            batch_size=batch_size,
+            convert_to_numpy=True,
+            show_progress_bar=False
+        )
+    return embeddings
+
+# Set in each embedding worker process by _init_embed_worker
+_worker_model = None
+
+def _init_embed_worker(threads: int, backend: str, onnx_path: str):
+    global _worker_model
+    _worker_model = load_embedding_model(backend, onnx_path, threads=threads)
+
+def _chunk_and_embed(fetched: list, chunker: Chunker, batch_size: int):
+    """Process-pool task: parse, chunk and embed a group of fetched transcripts together"""
+    start = time.perf_counter()
+    chunks = []
+    indexed = []
+    for transcript_id, fingerprint, transcript_json, event_id, meeting_name in fetched:
+        transcript = Transcript.from_json(transcript_json)
+        
+        # Add additional metadata to transcript
+        transcript.annotations = transcript.annotations or type('obj', (), {})()
+        transcript.annotations.event_id = event_id
+        transcript.annotations.meeting_name = meeting_name
+        
+        transcript_chunks = list(chunker.chunks(transcript, transcript_id))
+        chunks.extend(transcript_chunks)
+        indexed.append((transcript_id, fingerprint, len(transcript_chunks), transcript_fields(transcript)))
+    # The whole group is embedded together so batches span transcripts and sort by length; its
+    # size, and what the task returns across the process boundary, is bounded by transcripts_per_task
+    embeddings = embed_texts(_worker_model, [chunk.text for chunk in chunks], batch_size)
+    return indexed, chunks, embeddings, time.perf_counter() - start
+
+def transcript_fingerprint(transcript_model) -> str:
+    """Cheap change marker from the Firestore document, available before fetching the transcript file"""
+    parts = (transcript_model.created, transcript_model.generator, transcript_model.confidence)
+    return hashlib.sha1("|".join(str(part) for part in parts).encode()).hexdigest()
 
 class TranscriptIndexer:
-    def __init__(self, chunk_size: int = 500):
+    def __init__(self, chunker: Optional[Chunker] = None, embed_batch_size: int = 128,
+                 manifest_path: str = "ingest_manifest.sqlite"):
         # Load environment variables
         load_dotenv()
         
-        self.chunk_size = chunk_size
-        self.model = SentenceTransformer('all-MiniLM-L6-v2')
+        self.chunker = chunker or TokenChunker()
+        self.embed_batch_size = embed_batch_size
+        self.chunks_embedded = 0
+        self.embed_seconds = 0.0
+        # int8 ONNX embeddings stay within the parity threshold of the PyTorch ones, so either backend
+        # can write to the same index (see backend/check_onnx_parity.py)
+        self.embedding_backend = os.getenv('EMBEDDING_BACKEND', 'torch')
+        self.onnx_model_path = os.getenv('ONNX_MODEL_PATH', 'onnx_model')
+        self.model = load_embedding_model(self.embedding_backend, self.onnx_model_path)
+        self.manifest = IngestManifest(manifest_path)
+        
+        if os.getenv('VECTOR_BACKEND', 'pinecone') == 'local':
+            self.index = LocalIndex(
+                os.getenv('LOCAL_INDEX_PATH', 'local_index_data'),
+                dtype=os.getenv('LOCAL_INDEX_DTYPE', 'float32')
+            )
+        else:
+            self._connect_pinecone()
+
+        # Chunk text and meeting-level fields, hydrated by the backend after vector search
+        self.chunk_store = ChunkStore(os.getenv('CHUNK_STORE_PATH', 'chunk_store.sqlite'))
+
+        # BM25 index over chunk text, per namespace, queried alongside vector search
+        self.keyword_index_path = os.getenv('KEYWORD_INDEX_PATH', 'keyword_index_data')
+        self.keyword_indexes = {}
+
+        # Redis is only used to invalidate cached summaries after upserts
+        self.redis_client = redis.from_url(os.getenv('REDIS_URL', 'redis://localhost:6379'))
         
+        # Initialize CDP connections
+        self.fs = GCSFileSystem(project="cdp-seattle-21723dcf", token="anon")
+        fireo.connection(client=Client(
+            project="cdp-seattle-21723dcf",
+            credentials=AnonymousCredentials()
+        ))
+
+    def _connect_pinecone(self):
         # Initialize Pinecone with serverless config
         self.pc = Pinecone(api_key=os.getenv('PINECONE_API_KEY'))
         
@@ -53,133 +158,376 @@ class TranscriptIndexer:
                 time.sleep(1)
             
             self.index = self.pc.Index(self.index_name)
-        
-        # Initialize CDP connections
-        self.fs = GCSFileSystem(project="cdp-seattle-21723dcf", token="anon")
-        fireo.connection(client=Client(
-            project="cdp-seattle-21723dcf",
-            credentials=AnonymousCredentials()
-        ))
 
-    def process_transcript(self, transcript: Transcript) -> List[TranscriptChunk]:
-        """Process a transcript into chunks with metadata"""
-        chunks = []
-        current_chunk = []
-        current_length = 0
-        
-        # Create base metadata from transcript-level annotations
-        base_metadata = {}
-        if hasattr(transcript, 'annotations'):
-            for key, value in transcript.annotations.__dict__.items():
-                if value is not None:
-                    base_metadata[f"annotation_{key}"] = str(value)
-        
-        for sentence in transcript.sentences:
-            # Start with the base metadata from transcript
-            metadata = base_metadata.copy()
-
-            # Add sentence-specific metadata
-            metadata.update({
-                'start_time': str(sentence.start_time),
-                'end_time': str(sentence.end_time),
-                'speaker': sentence.speaker_name or f"Speaker {sentence.speaker_index}" if sentence.speaker_index else "Unknown",
-                'confidence': float(sentence.confidence),
-                'session_date': transcript.session_datetime,
-                'generator': transcript.generator
-            })
-            
-            # Add sentence-level annotations if they exist
-            if sentence.annotations:
-                for key, value in sentence.annotations.__dict__.items():
-                    if value is not None:
-                        metadata[f"annotation_{key}"] = str(value)
-
-            if current_length + len(sentence.text) > self.chunk_size and current_chunk:
-                chunks.append(TranscriptChunk(
-                    text=' '.join(current_chunk),
-                    metadata=metadata
-                ))
-                current_chunk = []
-                current_length = 0
-            
-            current_chunk.append(sentence.text)
-            current_length += len(sentence.text)
-        
-        print(metadata)
-        if current_chunk:
-            chunks.append(TranscriptChunk(
-                text=' '.join(current_chunk),
-                metadata=metadata
-            ))
-        
-        return chunks
+    @property
+    def chunker_version(self) -> str:
+        return f"{CHUNKER_VERSION}:{self.chunker.signature}"
 
-    def index_transcript(self, transcript: Transcript, namespace: str = "default"):
-        """Index a transcript into Pinecone"""
-        chunks = self.process_transcript(transcript)
-        
-        # Prepare vectors for batch upsert
+    def process_transcript(self, transcript: Transcript, transcript_id: Optional[str] = None):
+        """Stream a transcript's chunks with metadata"""
+        if transcript_id is None:
+            # Without a CDP id, fall back to a content hash so re-indexing still overwrites
+            content = "\n".join(sentence.text for sentence in transcript.sentences)
+            transcript_id = hashlib.sha1(f"{transcript.session_datetime}|{content}".encode()).hexdigest()[:16]
+        return self.chunker.chunks(transcript, transcript_id)
+
+    def embed_texts(self, texts: List[str]) -> np.ndarray:
+        start = time.perf_counter()
+        embeddings = embed_texts(self.model, texts, self.embed_batch_size)
+        self.chunks_embedded += len(texts)
+        self.embed_seconds += time.perf_counter() - start
+        return embeddings
+
+    def index_chunks(self, chunks: List[TranscriptChunk], namespace: str = "default"):
+        """Embed and upsert chunks, which may come from several transcripts"""
+        if not chunks:
+            return
+        self._store_chunks(chunks, namespace)
+        embeddings = self.embed_texts([chunk.text for chunk in chunks])
+        for batch in self._vector_batches(chunks, embeddings):
+            self._upsert(batch, namespace)
+        self._add_keywords(chunks, namespace)
+        self.keyword_index(namespace).flush()
+        self._invalidate_summaries(namespace)
+
+    def keyword_index(self, namespace: str) -> KeywordIndex:
+        if namespace not in self.keyword_indexes:
+            self.keyword_indexes[namespace] = KeywordIndex(self.keyword_index_path, namespace)
+        return self.keyword_indexes[namespace]
+
+    def _add_keywords(self, chunks: List[TranscriptChunk], namespace: str):
+        keyword_index = self.keyword_index(namespace)
+        for chunk in chunks:
+            keyword_index.add(chunk.id, chunk.text)
+
+    def _store_chunks(self, chunks: List[TranscriptChunk], namespace: str):
+        """
+        Write chunk text to the side store before its vectors exist, so every match can be hydrated.
+        Position and time span let the backend pull a hit's neighbouring chunks for summary context.
+        """
+        self.chunk_store.put_chunks(namespace, (
+            (chunk.id, chunk.transcript_id, chunk.position,
+             chunk.metadata['start_time'], chunk.metadata['end_time'], chunk.text)
+            for chunk in chunks
+        ))
+
+    def _vector_batches(self, chunks: List[TranscriptChunk], embeddings: np.ndarray):
+        """Yield upsert-sized lists of vector records"""
         vectors = []
-        for i, chunk in enumerate(chunks):
-            # Generate embedding using SentenceTransformer
-            vector = self.model.encode(chunk.text).tolist()
-            
-            # Add metadata and create vector record
+        for chunk, vector in zip(chunks, embeddings):
             vectors.append({
-                'id': f"chunk_{datetime.now().timestamp()}_{i}",
-                'values': vector,
-                'metadata': {
-                    **chunk.metadata,
-                    'text': chunk.text  # Store the original text in metadata
-                }
+                'id': chunk.id,
+                'values': vector.tolist(),
+                'metadata': chunk.metadata
             })
-        
-        # Upsert vectors in batches
-        batch_size = 100
-        for i in range(0, len(vectors), batch_size):
-            batch = vectors[i:i + batch_size]
-            self.index.upsert(
-                vectors=batch,
-                namespace=namespace
-            )
+            if len(vectors) == UPSERT_BATCH_SIZE:
+                yield vectors
+                vectors = []
+        if vectors:
+            yield vectors
+
+    def _upsert(self, vectors: List[Dict], namespace: str):
+        self.index.upsert(
+            vectors=vectors,
+            namespace=namespace
+        )
+
+    def index_transcript(self, transcript: Transcript, namespace: str = "default",
+                         transcript_id: Optional[str] = None):
+        """Index a transcript into Pinecone, a bounded slice of chunks at a time"""
+        chunks = self.process_transcript(transcript, transcript_id)
+        stored_fields = False
+        while batch := list(itertools.islice(chunks, self.embed_batch_size * 8)):
+            if not stored_fields:
+                self.chunk_store.put_transcript(namespace, batch[0].transcript_id, transcript_fields(transcript))
+                stored_fields = True
+            self.index_chunks(batch, namespace=namespace)
+
+    def _invalidate_summaries(self, namespace: str):
+        """Cached summaries may no longer reflect the namespace's contents after an upsert"""
+        try:
+            invalidate_namespace(self.redis_client, namespace)
+        except Exception as e:
+            print(f"Summary cache invalidation failed: {e}")
+
+    def _fetch_transcript(self, transcript_model):
+        """Read transcript JSON from GCS and dereference its event and body in Firestore"""
+        with self.fs.open(transcript_model.file_ref.get().uri, "r") as open_resource:
+            transcript_json = open_resource.read()
+        event = transcript_model.session_ref.get().event_ref.get()
+        body = event.body_ref.get()
+        return transcript_model.id, transcript_fingerprint(transcript_model), transcript_json, event.id, body.name
+
+    def _commit_transcript(self, transcript_id: str, fingerprint: str, chunk_count: int, namespace: str):
+        """Record a fully upserted transcript, deleting chunks left over from a longer previous version"""
+        previous = self.manifest.chunk_count(transcript_id, namespace) or 0
+        if previous > chunk_count:
+            stale_ids = [f"{transcript_id}_{offset}" for offset in range(chunk_count, previous)]
+            self.index.delete(ids=stale_ids, namespace=namespace)
+            self.keyword_index(namespace).delete(stale_ids)
+            self.chunk_store.delete_chunks(namespace, stale_ids)
+        self.manifest.record(transcript_id, namespace, fingerprint, self.chunker_version, MODEL_NAME, chunk_count)
+
+    def index_multiple_transcripts(self, limit: int = 10, namespace: str = "default",
+                                   fetch_workers: int = 8, embed_workers: int = 2, upsert_workers: int = 4,
+                                   transcripts_per_task: int = 4, queue_size: int = 32, incremental: bool = True):
+        """
+        Index multiple transcripts from CDP through a streaming pipeline:
+        I/O threads fetch transcripts and metadata, a process pool chunks and embeds,
+        and a thread pool upserts. Bounded queues between stages apply backpressure,
+        so throughput is limited by the slowest stage rather than the sum of all stages.
+
+        With incremental set, transcripts the manifest already records with the same
+        fingerprint, chunker and model are skipped.
+        """
+        # Vectors indexed before chunk ids were deterministic would otherwise sit next to their replacements
+        if not self.manifest.has_namespace(namespace):
+            self.purge_legacy_chunks(namespace)
 
-    def index_multiple_transcripts(self, limit: int = 10, namespace: str = "default"):
-        """Index multiple transcripts from CDP"""
         print(f"Fetching {limit} transcripts from CDP...")
         transcript_models = list(db_models.Transcript.collection.fetch(limit))
-        
-        print("Processing and indexing transcripts...")
-        for transcript_model in tqdm(transcript_models):
+
+        if incremental:
+            total = len(transcript_models)
+            transcript_models = [
+                transcript_model for transcript_model in transcript_models
+                if not self.manifest.is_current(
+                    transcript_model.id, namespace, transcript_fingerprint(transcript_model),
+                    self.chunker_version, MODEL_NAME
+                )
+            ]
+            print(f"Skipping {total - len(transcript_models)} unchanged transcripts")
+
+        fetched = queue.Queue(maxsize=queue_size)
+        embedded = queue.Queue(maxsize=queue_size)
+        busy = {'fetch': 0.0, 'embed': 0.0, 'upsert': 0.0}  # seconds of work per stage, summed over workers
+        busy_lock = threading.Lock()
+
+        def record_busy(stage: str, seconds: float):
+            with busy_lock:
+                busy[stage] += seconds
+
+        def fetch_one(transcript_model):
+            start = time.perf_counter()
+            try:
+                item = self._fetch_transcript(transcript_model)
+            except Exception as e:
+                print(f"Error fetching transcript: {e}")
+                return
+            finally:
+                record_busy('fetch', time.perf_counter() - start)
+            fetched.put(item)
+
+        def fetch_stage():
+            with ThreadPoolExecutor(max_workers=fetch_workers) as pool:
+                for transcript_model in transcript_models:
+                    pool.submit(fetch_one, transcript_model)
+            fetched.put(_DONE)
+
+        def embed_stage():
+            try:
+                run_embed_stage()
+            finally:
+                embedded.put(_DONE)
+
+        def run_embed_stage():
+            in_flight = deque()
+
+            def drain(block: bool):
+                while in_flight and (block or in_flight[0].done()):
+                    try:
+                        result = in_flight.popleft().result()
+                        record_busy('embed', result[-1])
+                        embedded.put(result[:-1])
+                    except Exception as e:
+                        print(f"Error processing transcripts: {e}")
+
+            # Spawn rather than fork: the parent already holds threads and a loaded model
+            with ProcessPoolExecutor(
+                max_workers=embed_workers,
+                mp_context=multiprocessing.get_context("spawn"),
+                initializer=_init_embed_worker,
+                initargs=(
+                    max(1, (os.cpu_count() or 1) // embed_workers),
+                    self.embedding_backend,
+                    self.onnx_model_path
+                )
+            ) as pool:
+                group = []
+                while True:
+                    item = fetched.get()
+                    if item is not _DONE:
+                        group.append(item)
+                    if group and (item is _DONE or len(group) >= transcripts_per_task):
+                        in_flight.append(pool.submit(_chunk_and_embed, group, self.chunker, self.embed_batch_size))
+                        group = []
+                    drain(block=False)
+                    while len(in_flight) > embed_workers * 2:
+                        in_flight[0].exception()  # wait for the oldest task before queueing more
+                        drain(block=False)
+                    if item is _DONE:
+                        break
+                drain(block=True)
+
+        def upsert_one(vectors: List[Dict]) -> bool:
+            start = time.perf_counter()
             try:
-                # Read transcript from GCS
-                with self.fs.open(transcript_model.file_ref.get().uri, "r") as open_resource:
-                    transcript = Transcript.from_json(open_resource.read())
-                    
-                    # Add event metadata
-                    event = transcript_model.session_ref.get().event_ref.get()
-                    body = event.body_ref.get()
-                    
-                    # Add additional metadata to transcript
-                    transcript.annotations = transcript.annotations or type('obj', (), {})()
-                    transcript.annotations.event_id = event.id
-                    transcript.annotations.meeting_name = body.name
-                    
-                    # Index the transcript
-                    self.index_transcript(transcript, namespace=namespace)
-                    
+                self._upsert(vectors, namespace)
+                return True
             except Exception as e:
-                print(f"Error processing transcript: {e}")
-                continue
+                print(f"Error upserting vectors: {e}")
+                return False
+            finally:
+                record_busy('upsert', time.perf_counter() - start)
+
+        # (upsert futures, transcripts they complete), committed to the manifest once all succeed
+        commits = deque()
+
+        def commit_ready(block: bool):
+            # Keyword postings must be durable before the manifest marks a transcript as indexed
+            self.keyword_index(namespace).flush()
+            while commits and (block or all(future.done() for future in commits[0][0])):
+                futures, transcripts = commits.popleft()
+                if all(future.result() for future in futures):
+                    for transcript_id, fingerprint, chunk_count, _ in transcripts:
+                        self._commit_transcript(transcript_id, fingerprint, chunk_count, namespace)
+
+        print("Processing and indexing transcripts...")
+        start = time.perf_counter()
+        stages = [threading.Thread(target=fetch_stage, daemon=True), threading.Thread(target=embed_stage, daemon=True)]
+        for stage in stages:
+            stage.start()
+
+        total_chunks = 0
+        progress = tqdm(total=len(transcript_models))
+        with ThreadPoolExecutor(max_workers=upsert_workers) as pool:
+            in_flight = deque()
+            while (item := embedded.get()) is not _DONE:
+                transcripts, chunks, embeddings = item
+                for transcript_id, _, _, fields in transcripts:
+                    self.chunk_store.put_transcript(namespace, transcript_id, fields)
+                self._store_chunks(chunks, namespace)
+                futures = []
+                for batch in self._vector_batches(chunks, embeddings):
+                    futures.append(pool.submit(upsert_one, batch))
+                    in_flight.append(futures[-1])
+                    while len(in_flight) > upsert_workers * 2:
+                        in_flight.popleft().result()
+                self._add_keywords(chunks, namespace)
+                commits.append((futures, transcripts))
+                commit_ready(block=False)
+                total_chunks += len(chunks)
+                progress.update(len(transcripts))
+            commit_ready(block=True)
+        progress.close()
+
+        self.keyword_index(namespace).flush()
+        self.keyword_index(namespace).compact()
+
+        self._invalidate_summaries(namespace)
+
+        elapsed = time.perf_counter() - start
+        print(f"Indexed {total_chunks} chunks in {elapsed:.1f}s ({total_chunks / elapsed:.1f} chunks/sec)")
+        for stage, workers in (('fetch', fetch_workers), ('embed', embed_workers), ('upsert', upsert_workers)):
+            print(f"  {stage}: {busy[stage]:.1f}s busy, {busy[stage] / (workers * elapsed):.0%} utilisation of {workers} workers")
+
+    def purge_legacy_chunks(self, namespace: str = "default", batch_size: int = 1000):
+        """Delete vectors with the old chunk_<timestamp>_<i> ids"""
+        # List everything first so deletes don't shift the pages still being listed
+        ids = [vector_id for page in self.index.list(namespace=namespace, prefix='chunk_') for vector_id in page]
+        for start in range(0, len(ids), batch_size):
+            self.index.delete(ids=ids[start:start + batch_size], namespace=namespace)
+        print(f"Purged {len(ids)} legacy vectors from {namespace}")
+
+    def backfill_session_day(self, namespace: str = "default", batch_size: int = 100):
+        """Add the numeric session_day field to vectors indexed before it existed"""
+        updated = 0
+        for ids in tqdm(self.index.list(namespace=namespace)):
+            for start in range(0, len(ids), batch_size):
+                fetched = self.index.fetch(ids=ids[start:start + batch_size], namespace=namespace)
+                for vector_id, vector in fetched.vectors.items():
+                    metadata = vector.metadata or {}
+                    if 'session_day' in metadata or not metadata.get('session_date'):
+                        continue
+                    self.index.update(
+                        id=vector_id,
+                        set_metadata={'session_day': epoch_day(metadata['session_date'])},
+                        namespace=namespace
+                    )
+                    updated += 1
+        print(f"Backfilled session_day on {updated} vectors")
 
 def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--backfill-session-day', action='store_true',
+                        help="add session_day to existing vectors instead of indexing")
+    parser.add_argument('--purge-legacy-ids', action='store_true',
+                        help="delete vectors with the old chunk_<timestamp>_<i> ids instead of indexing")
+    parser.add_argument('--embed-batch-size', type=int, default=128,
+                        help="chunks per embedding forward pass")
+    parser.add_argument('--fetch-workers', type=int, default=8, help="threads fetching transcripts and metadata")
+    parser.add_argument('--embed-workers', type=int, default=2, help="processes chunking and embedding")
+    parser.add_argument('--upsert-workers', type=int, default=4, help="threads upserting vector batches")
+    parser.add_argument('--full', action='store_true',
+                        help="re-index every transcript instead of only new or changed ones")
+    parser.add_argument('--manifest', default="ingest_manifest.sqlite",
+                        help="SQLite checkpoint of indexed transcripts")
+    parser.add_argument('--build-ivf', action='store_true',
+                        help="cluster the local index for IVF search after indexing (VECTOR_BACKEND=local)")
+    parser.add_argument('--chunker', default="tokens", choices=sorted(CHUNKERS),
+                        help="chunk layout for the main namespace")
+    parser.add_argument('--max-tokens', type=int, default=256, help="MiniLM tokens per chunk, at most 256")
+    parser.add_argument('--overlap-tokens', type=int, default=32,
+                        help="tokens of trailing sentences repeated at the start of the next chunk")
+    parser.add_argument('--tokenizer', default=TOKENIZER_NAME,
+                        help="tokenizer name on the Hugging Face hub, or a local tokenizer.json / directory")
+    parser.add_argument('--extra-granularities', nargs='*', default=[], choices=sorted(CHUNKERS),
+                        help="also index these chunk layouts, each into its own namespace seattle-<layout>")
+    args = parser.parse_args()
+
+    def chunker(name: str) -> Chunker:
+        return create_chunker(name, max_tokens=args.max_tokens, overlap_tokens=args.overlap_tokens,
+                              tokenizer=args.tokenizer)
+
     # Initialize indexer
-    indexer = TranscriptIndexer()
+    indexer = TranscriptIndexer(
+        chunker=chunker(args.chunker),
+        embed_batch_size=args.embed_batch_size,
+        manifest_path=args.manifest
+    )
+
+    if args.backfill_session_day:
+        indexer.backfill_session_day(namespace="seattle")
+        return
+
+    if args.purge_legacy_ids:
+        indexer.purge_legacy_chunks(namespace="seattle")
+        return
 
     # Index transcripts
     indexer.index_multiple_transcripts(
         limit=2000,  # Adjust limit as needed
-        namespace="seattle"  # You can organize by city/region
+        namespace="seattle",  # You can organize by city/region
+        fetch_workers=args.fetch_workers,
+        embed_workers=args.embed_workers,
+        upsert_workers=args.upsert_workers,
+        incremental=not args.full
     )
+
+    # Other granularities re-fetch transcripts; the manifest skips those already current per namespace
+    for granularity in args.extra_granularities:
+        indexer.chunker = chunker(granularity)
+        indexer.index_multiple_transcripts(
+            limit=2000,
+            namespace=f"seattle-{granularity}",
+            fetch_workers=args.fetch_workers,
+            embed_workers=args.embed_workers,
+            upsert_workers=args.upsert_workers,
+            incremental=not args.full
+        )
+
+    if args.build_ivf and isinstance(indexer.index, LocalIndex):
+        indexer.index.build_ivf(namespace="seattle")
     
     print("Indexing complete!")
 
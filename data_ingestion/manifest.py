@@ -0,0 +1,53 @@
+"""
+Local SQLite checkpoint of indexed transcripts, so ingestion can resume and skip unchanged work.
+"""
+
+import sqlite3
+from datetime import datetime
+from typing import Optional
+
+class IngestManifest:
+    def __init__(self, path: str = "ingest_manifest.sqlite"):
+        self.conn = sqlite3.connect(path)
+        self.conn.execute("""
+            CREATE TABLE IF NOT EXISTS transcripts (
+                transcript_id TEXT NOT NULL,
+                namespace TEXT NOT NULL,
+                fingerprint TEXT NOT NULL,
+                chunker_version TEXT NOT NULL,
+                model_version TEXT NOT NULL,
+                chunk_count INTEGER NOT NULL,
+                indexed_at TEXT NOT NULL,
+                PRIMARY KEY (transcript_id, namespace)
+            )
+        """)
+        self.conn.commit()
+
+    def is_current(self, transcript_id: str, namespace: str, fingerprint: str,
+                   chunker_version: str, model_version: str) -> bool:
+        row = self.conn.execute(
+            "SELECT fingerprint, chunker_version, model_version FROM transcripts "
+            "WHERE transcript_id = ? AND namespace = ?",
+            (transcript_id, namespace)
+        ).fetchone()
+        return row == (fingerprint, chunker_version, model_version)
+
+    def has_namespace(self, namespace: str) -> bool:
+        row = self.conn.execute("SELECT 1 FROM transcripts WHERE namespace = ? LIMIT 1", (namespace,)).fetchone()
+        return row is not None
+
+    def chunk_count(self, transcript_id: str, namespace: str) -> Optional[int]:
+        row = self.conn.execute(
+            "SELECT chunk_count FROM transcripts WHERE transcript_id = ? AND namespace = ?",
+            (transcript_id, namespace)
+        ).fetchone()
+        return row[0] if row else None
+
+    def record(self, transcript_id: str, namespace: str, fingerprint: str,
+               chunker_version: str, model_version: str, chunk_count: int):
+        self.conn.execute(
+            "INSERT OR REPLACE INTO transcripts VALUES (?, ?, ?, ?, ?, ?, ?)",
+            (transcript_id, namespace, fingerprint, chunker_version, model_version,
+             chunk_count, datetime.now().isoformat())
+        )
+        self.conn.commit()